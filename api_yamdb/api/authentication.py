@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from reviews.models import User
+from .cache import get_generation, user_version_key
+
+# Поля, которых достаточно для проверки прав. Остальные, включая хэш
+# пароля, в общий кэш не попадают.
+CACHED_USER_FIELDS = ('id', 'username', 'role', 'is_staff', 'is_superuser',
+                      'is_active')
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация, которая берёт пользователя из кэша.
+    Ключ содержит версию пользователя, поэтому любое его
+    изменение сразу делает закэшированную копию недействительной.
+    В кэше только CACHED_USER_FIELDS: полный профиль нужно
+    загружать из БД.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        key = 'user:fields:{}:{}'.format(
+            user_id, get_generation(user_version_key(user_id)))
+        fields = cache.get(key)
+        if fields is not None:
+            return User(**fields)
+        user = super().get_user(validated_token)
+        cache.set(key, {field: getattr(user, field)
+                        for field in CACHED_USER_FIELDS},
+                  settings.USER_CACHE_TIMEOUT)
+        return user
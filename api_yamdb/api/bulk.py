@@ -0,0 +1,155 @@
+from django.conf import settings
+from django.db import connection, transaction
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+
+from reviews.models import (Category, ChangeLogEntry, Genre, Review, Title,
+                            TitleStats)
+from .cache import CATALOG_GENERATION_KEY, bump_generation
+from .changes import record_changes
+from .dictionaries import slug_dictionary
+from .search import update_search_vectors
+from .serializers import ReviewBulkItemSerializer, TitleBulkItemSerializer
+
+
+def created(index, pk):
+    return {'index': index, 'status': 'created', 'id': pk}
+
+
+def failed(index, errors):
+    return {'index': index, 'status': 'error', 'errors': errors}
+
+
+def batch_status(results):
+    """201 — создано всё, 400 — ничего, 207 — часть пакета."""
+    created_count = sum(result['status'] == 'created' for result in results)
+    if created_count == len(results):
+        return status.HTTP_201_CREATED
+    if not created_count:
+        return status.HTTP_400_BAD_REQUEST
+    return status.HTTP_207_MULTI_STATUS
+
+
+def validate_batch(data, item_serializer):
+    """
+    Проверяет размер пакета и поля каждого элемента.
+    Возвращает корректные элементы и заготовку списка результатов.
+    """
+    if not isinstance(data, list) or not data:
+        raise ValidationError('Ожидается непустой список объектов.')
+    if len(data) > settings.BULK_MAX_ITEMS:
+        raise ValidationError(
+            f'В пакете может быть не больше {settings.BULK_MAX_ITEMS} '
+            'объектов.')
+    items = []
+    results = [None] * len(data)
+    for index, item in enumerate(data):
+        serializer = item_serializer(data=item)
+        if serializer.is_valid():
+            items.append((index, serializer.validated_data))
+        else:
+            results[index] = failed(index, serializer.errors)
+    return items, results
+
+
+def save_all(model, objects):
+    """bulk_create, а где СУБД не возвращает id — сохранение по одному."""
+    if connection.features.can_return_ids_from_bulk_insert:
+        return model.objects.bulk_create(objects)
+    for obj in objects:
+        obj.save()
+    return objects
+
+
+def create_titles(data):
+    """Пакетное создание тайтлов со слагами жанров и категорий."""
+    items, results = validate_batch(data, TitleBulkItemSerializer)
+    genres = {slug: genre.pk
+              for slug, genre in slug_dictionary(Genre).items()}
+    categories = {slug: category.pk
+                  for slug, category in slug_dictionary(Category).items()}
+    resolved = []
+    for index, item in items:
+        errors = {}
+        missing = [slug for slug in item['genre'] if slug not in genres]
+        if missing:
+            errors['genre'] = [f'Жанры не найдены: {", ".join(missing)}.']
+        if item['category'] not in categories:
+            errors['category'] = ['Категория не найдена.']
+        if errors:
+            results[index] = failed(index, errors)
+        else:
+            resolved.append((index, item))
+    if not resolved:
+        return results
+    with transaction.atomic():
+        titles = save_all(Title, [
+            Title(
+                name=item['name'],
+                year=item['year'],
+                description=item.get('description'),
+                category_id=categories[item['category']],
+            )
+            for _, item in resolved
+        ])
+        Title.genre.through.objects.bulk_create(
+            Title.genre.through(title_id=title.pk, genre_id=genres[slug])
+            for title, (_, item) in zip(titles, resolved)
+            for slug in dict.fromkeys(item['genre'])
+        )
+    update_search_vectors([title.pk for title in titles])
+    bump_generation(CATALOG_GENERATION_KEY)
+    for title, (index, _) in zip(titles, resolved):
+        results[index] = created(index, title.pk)
+    return results
+
+
+def create_reviews(user, data):
+    """
+    Пакетное создание отзывов пользователя на разные произведения.
+    Существование произведений и уникальность отзывов проверяются
+    одним запросом на весь пакет.
+    """
+    items, results = validate_batch(data, ReviewBulkItemSerializer)
+    title_ids = {item['title'] for _, item in items}
+    titles = set(Title.objects.filter(
+        pk__in=title_ids).values_list('pk', flat=True))
+    reviewed = set(Review.objects.filter(
+        author=user, title_id__in=title_ids,
+    ).values_list('title_id', flat=True))
+    resolved = []
+    for index, item in items:
+        if item['title'] not in titles:
+            results[index] = failed(
+                index, {'title': ['Произведение не найдено.']})
+        elif item['title'] in reviewed:
+            results[index] = failed(index, {'non_field_errors': [
+                'Вы не можете добавить более одного отзыва на произведение'
+            ]})
+        else:
+            reviewed.add(item['title'])
+            resolved.append((index, item))
+    if not resolved:
+        return results
+    with transaction.atomic():
+        reviews = save_all(Review, [
+            Review(
+                author=user,
+                title_id=item['title'],
+                text=item['text'],
+                score=item['score'],
+            )
+            for _, item in resolved
+        ])
+        Title.apply_scores({
+            review.title_id: (review.score, 1) for review in reviews
+        })
+        TitleStats.add_scores(
+            [(review.title_id, review.score) for review in reviews])
+        if connection.features.can_return_ids_from_bulk_insert:
+            # bulk_create не отправляет post_save, журнал пишется пакетом.
+            record_changes(reviews, ChangeLogEntry.CREATED)
+    bump_generation(CATALOG_GENERATION_KEY)
+    for review, (index, _) in zip(reviews, resolved):
+        results[index] = created(index, review.pk)
+    return results
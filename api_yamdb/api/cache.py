@@ -0,0 +1,51 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+CATALOG_GENERATION_KEY = 'catalog:generation'
+TITLE_SEARCH_GENERATION_KEY = 'titles:search:generation'
+
+
+def get_generation(key):
+    """Текущее поколение данных: меняется при каждой записи в них."""
+    generation = cache.get(key)
+    if generation is None:
+        # Начальное значение от времени, чтобы после вытеснения ключа
+        # не вернуться к поколению, под которым лежат старые данные.
+        cache.add(key, int(time.time() * 1000))
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(key):
+    """Делает недействительным всё, что закэшировано под ключом поколения."""
+    try:
+        cache.incr(key)
+    except ValueError:
+        get_generation(key)
+
+
+def bump_generation_on_commit(key):
+    """
+    Меняет поколение сразу и ещё раз после фиксации транзакции:
+    ответ, закэшированный параллельным запросом между первой сменой
+    и фиксацией, содержит старые данные и не должен пережить её.
+    """
+    bump_generation(key)
+    transaction.on_commit(lambda: bump_generation(key))
+
+
+def user_version_key(user_id):
+    return f'user:{user_id}:version'
+
+
+def classification_version_key(model):
+    return f'{model._meta.label_lower}:version'
+
+
+def make_etag(*parts):
+    digest = hashlib.md5(
+        ':'.join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
@@ -0,0 +1,133 @@
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from reviews.models import ChangeLogEntry, Comments, Review
+
+# Произведения отзывов, удаляемых прямо сейчас: каскад удаляет
+# комментарии раньше отзывов, и их записи журнала берут id произведения
+# отсюда, а не запросом на каждый комментарий.
+_deleting_reviews = {}
+
+
+def remember_review_titles(titles):
+    """Запоминает {id отзыва: id произведения} на время удаления."""
+    _deleting_reviews.update(titles)
+
+
+def forget_review_titles(review_ids):
+    for review_id in review_ids:
+        _deleting_reviews.pop(review_id, None)
+
+
+def comment_title_id(comment):
+    if Comments.review.is_cached(comment):
+        return comment.review.title_id
+    title_id = _deleting_reviews.get(comment.review_id)
+    if title_id is None:
+        title_id = Review.objects.filter(
+            pk=comment.review_id).values_list('title_id', flat=True).get()
+    return title_id
+
+
+def review_payload(review):
+    return {
+        'id': review.pk,
+        'title_id': review.title_id,
+        'author': review.author.username,
+        'text': review.text,
+        'score': review.score,
+        'pub_date': review.pub_date,
+        'updated_at': review.updated_at,
+    }
+
+
+def comment_payload(comment):
+    return {
+        'id': comment.pk,
+        'review_id': comment.review_id,
+        'author': comment.author.username,
+        'text': comment.text,
+        'pub_date': comment.pub_date,
+        'updated_at': comment.updated_at,
+    }
+
+
+def change_entry(instance, action):
+    """Несохранённая запись журнала об изменении отзыва или комментария."""
+    if isinstance(instance, Review):
+        model, title_id, review_id, payload = (
+            ChangeLogEntry.REVIEW, instance.title_id, instance.pk,
+            review_payload)
+    else:
+        model, title_id, review_id, payload = (
+            ChangeLogEntry.COMMENT, comment_title_id(instance),
+            instance.review_id, comment_payload)
+    return ChangeLogEntry(
+        model=model,
+        action=action,
+        object_id=instance.pk,
+        title_id=title_id,
+        review_id=review_id,
+        payload='' if action == ChangeLogEntry.DELETED else json.dumps(
+            payload(instance), cls=DjangoJSONEncoder, ensure_ascii=False),
+    )
+
+
+def record_change(instance, action):
+    """
+    Пишет изменение в журнал. Вызывается из обработчиков сигналов,
+    поэтому попадает в транзакцию самого изменения.
+    """
+    change_entry(instance, action).save()
+
+
+def record_changes(instances, action):
+    ChangeLogEntry.objects.bulk_create(
+        change_entry(instance, action) for instance in instances)
+
+
+def annotate_last_change(queryset, field):
+    """
+    Добавляет к выборке id и время последней записи журнала, у которой
+    `field` (title_id или review_id) равен pk строки, — водяной знак
+    для условных запросов списков. Подзапросы идут по индексу журнала.
+    """
+    changes = ChangeLogEntry.objects.filter(
+        **{field: OuterRef('pk')}).order_by('-id')
+    return queryset.annotate(
+        last_change_id=Subquery(changes.values('id')[:1]),
+        last_changed_at=Subquery(changes.values('created')[:1]),
+    )
+
+
+def changes_after(cursor, limit, title_id=None):
+    """
+    Изменения после курсора одним запросом по индексу. Записи моложе
+    CHANGE_FEED_SETTLE_SECONDS не отдаются: id выдаются до фиксации
+    транзакций, и незафиксированная запись с меньшим id иначе могла
+    бы оказаться позади курсора клиента.
+    """
+    entries = ChangeLogEntry.objects.filter(
+        id__gt=cursor,
+        created__lte=timezone.now() - timedelta(
+            seconds=settings.CHANGE_FEED_SETTLE_SECONDS),
+    )
+    if title_id is not None:
+        entries = entries.filter(title_id=title_id)
+    return [
+        {
+            'cursor': entry.id,
+            'model': entry.model,
+            'action': entry.action,
+            'id': entry.object_id,
+            'title_id': entry.title_id,
+            'changed_at': entry.created,
+            'data': json.loads(entry.payload) if entry.payload else None,
+        }
+        for entry in entries.order_by('id')[:limit]
+    ]
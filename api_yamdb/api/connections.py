@@ -0,0 +1,83 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+class ConnectionStats:
+    """Замеры выдачи соединений с БД запросам в памяти процесса."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def record(self, wait, broken):
+        with self.lock:
+            self.checkouts += 1
+            self.broken += broken
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def record_open(self):
+        with self.lock:
+            self.opened += 1
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'conn_max_age': settings.DATABASES['default'][
+                    'CONN_MAX_AGE'],
+                'checkouts': self.checkouts,
+                'opened': self.opened,
+                'reused': self.checkouts - self.broken,
+                'broken': self.broken,
+                'avg_wait_ms': round(
+                    self.wait_total * 1000 / self.checkouts, 3)
+                if self.checkouts else 0,
+                'max_wait_ms': round(self.wait_max * 1000, 3),
+            }
+
+    def reset(self):
+        with self.lock:
+            self.checkouts = self.opened = self.broken = 0
+            self.wait_total = self.wait_max = 0.0
+
+
+stats = ConnectionStats()
+
+
+@receiver(request_started)
+def checkout_connections(**kwargs):
+    """
+    Проверяет постоянные соединения перед запросом: открытое соединение,
+    простоявшее дольше DB_HEALTH_CHECK_INTERVAL, при обрыве закрывается
+    и откроется заново при первом SQL-запросе. Закрытые соединения
+    заранее не открываются — запросу может не понадобиться БД.
+    """
+    for connection in connections.all():
+        if connection.connection is None:
+            continue
+        started = time.perf_counter()
+        broken = False
+        idle = time.monotonic() - getattr(connection, 'released_at', 0)
+        if (not connection.in_atomic_block
+                and idle > settings.DB_HEALTH_CHECK_INTERVAL
+                and not connection.is_usable()):
+            connection.close()
+            broken = True
+        stats.record(time.perf_counter() - started, broken)
+
+
+@receiver(connection_created)
+def count_opened_connection(**kwargs):
+    stats.record_open()
+
+
+@receiver(request_finished)
+def release_connections(**kwargs):
+    for connection in connections.all():
+        connection.released_at = time.monotonic()
@@ -0,0 +1,42 @@
+import threading
+import time
+
+from django.conf import settings
+
+from .cache import classification_version_key, get_generation
+
+# Словари классификаций в памяти процесса:
+# модель -> (версия, момент загрузки, {slug: объект}). Версия хранится
+# в общем кэше и меняется при любой записи в таблицу, так что
+# устаревший словарь перечитывается во всех процессах.
+_dictionaries = {}
+_lock = threading.Lock()
+
+
+def is_fresh(cached, version):
+    return (cached is not None and cached[0] == version
+            and time.monotonic() - cached[1]
+            < settings.CLASSIFICATION_CACHE_TIMEOUT)
+
+
+def slug_dictionary(model):
+    """
+    Словарь slug -> объект для наследника Classification. В устоявшемся
+    режиме обходится одним чтением версии из кэша, без запросов к БД.
+    Объекты общие для всех потоков, изменять их нельзя.
+    """
+    version = get_generation(classification_version_key(model))
+    cached = _dictionaries.get(model)
+    if not is_fresh(cached, version):
+        with _lock:
+            cached = _dictionaries.get(model)
+            if not is_fresh(cached, version):
+                cached = (version, time.monotonic(),
+                          {obj.slug: obj for obj in model.objects.all()})
+                _dictionaries[model] = cached
+    return cached[2]
+
+
+def reset():
+    with _lock:
+        _dictionaries.clear()
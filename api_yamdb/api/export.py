@@ -0,0 +1,106 @@
+import datetime
+from collections import defaultdict
+from itertools import islice
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+from reviews.models import Category, Comments, Genre, Review, Title, User
+
+
+def title_since(since):
+    return Q(updated_at__gte=since)
+
+
+# Наборы данных повторяют раскладку static/data/*.csv:
+# имя файла, модель, {колонка: путь в values()}, фильтр updated_since.
+DATASETS = {
+    'users': (User, {
+        'id': 'id',
+        'username': 'username',
+        'email': 'email',
+        'role': 'role',
+        'bio': 'bio',
+        'first_name': 'first_name',
+        'last_name': 'last_name',
+    }, None),
+    'category': (Category, {'id': 'id', 'name': 'name', 'slug': 'slug'},
+                 None),
+    'genre': (Genre, {'id': 'id', 'name': 'name', 'slug': 'slug'}, None),
+    'titles': (Title, {
+        'id': 'id',
+        'name': 'name',
+        'year': 'year',
+        'category': 'category_id',
+        'description': 'description',
+        'rating': 'rating',
+    }, title_since),
+    'genre_title': (Title.genre.through, {
+        'id': 'id',
+        'title_id': 'title_id',
+        'genre_id': 'genre_id',
+    }, lambda since: Q(title__in=Title.objects.filter(title_since(since)))),
+    'review': (Review, {
+        'id': 'id',
+        'title_id': 'title_id',
+        'text': 'text',
+        'author': 'author_id',
+        'score': 'score',
+        'pub_date': 'pub_date',
+    }, lambda since: Q(updated_at__gte=since)),
+    'comments': (Comments, {
+        'id': 'id',
+        'review_id': 'review_id',
+        'text': 'text',
+        'author': 'author_id',
+        'pub_date': 'pub_date',
+    }, lambda since: Q(updated_at__gte=since)),
+}
+
+encoder = DjangoJSONEncoder()
+
+
+def export_value(value):
+    """Даты — в формате static/data: ISO 8601 с миллисекундами и Z."""
+    if isinstance(value, datetime.datetime):
+        return encoder.default(value)
+    return value
+
+
+def export_records(dataset, since=None, chunk_size=None):
+    """
+    Записи набора данных в порядке id. Строки читаются из БД
+    итератором по chunk_size, у произведений добавляется список
+    id жанров (в CSV он выгружается отдельным набором genre_title).
+    """
+    model, columns, since_filter = DATASETS[dataset]
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    queryset = model.objects.order_by('pk')
+    if since is not None and since_filter is not None:
+        queryset = queryset.filter(since_filter(since))
+    rows = queryset.values_list(*columns.values()).iterator(
+        chunk_size=chunk_size)
+    names = list(columns)
+    chunk = list(islice(rows, chunk_size))
+    while chunk:
+        genres = title_genres(chunk) if model is Title else {}
+        for row in chunk:
+            record = dict(zip(names, map(export_value, row)))
+            if model is Title:
+                record['genre'] = genres.get(record['id'], [])
+            yield record
+        chunk = list(islice(rows, chunk_size))
+
+
+def title_genres(rows):
+    genres = defaultdict(list)
+    for title_id, genre_id in Title.genre.through.objects.filter(
+        title_id__in=[row[0] for row in rows],
+    ).order_by('pk').values_list('title_id', 'genre_id'):
+        genres[title_id].append(genre_id)
+    return genres
+
+
+def export_columns(dataset):
+    return list(DATASETS[dataset][1])
@@ -1,6 +1,7 @@
 from django_filters import rest_framework as filters
 
 from reviews.models import Title
+from .search import search_titles
 
 
 class TitleFilter(filters.FilterSet):
@@ -8,7 +9,23 @@ class TitleFilter(filters.FilterSet):
     year = filters.NumberFilter(field_name='year')
     genre = filters.CharFilter(field_name='genre__slug')
     category = filters.CharFilter(field_name='category__slug')
+    search = filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ('name', 'year', 'genre', 'category')
+        fields = ('name', 'year', 'genre', 'category', 'search')
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
+
+
+class LeaderboardFilter(filters.FilterSet):
+    year = filters.NumberFilter(field_name='year')
+    genre = filters.CharFilter(field_name='genre__slug')
+    category = filters.CharFilter(field_name='category__slug')
+    min_reviews = filters.NumberFilter(field_name='review_count',
+                                       lookup_expr='gte')
+
+    class Meta:
+        model = Title
+        fields = ('year', 'genre', 'category', 'min_reviews')
@@ -0,0 +1,144 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from reviews.models import OutboxMessage
+
+
+def enqueue_mail(subject, message, recipient, from_email=None):
+    """Ставит письмо в очередь вместо отправки во время запроса."""
+    return OutboxMessage.objects.create(
+        subject=subject,
+        message=message,
+        recipient=recipient,
+        from_email=from_email,
+    )
+
+
+def pending_messages(max_attempts):
+    return OutboxMessage.objects.filter(
+        sent_at__isnull=True,
+        attempts__lt=max_attempts,
+    )
+
+
+def claim_batch(batch_size, max_attempts, lease):
+    """
+    Забирает пачку готовых к отправке писем в короткой транзакции:
+    попытка засчитывается сразу, а следующая назначается через lease
+    секунд — если воркер упадёт во время отправки, письма вернутся
+    в очередь. Сама отправка идёт уже вне транзакции.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            pending_messages(max_attempts)
+            .filter(next_attempt_at__lte=now)
+            .select_for_update(skip_locked=True)
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        for outgoing in batch:
+            outgoing.attempts += 1
+            outgoing.next_attempt_at = now + timedelta(seconds=lease)
+        OutboxMessage.objects.bulk_update(
+            batch, ('attempts', 'next_attempt_at'))
+    return batch
+
+
+def retry_later(outgoing, error, backoff):
+    outgoing.last_error = str(error)
+    outgoing.next_attempt_at = timezone.now() + timedelta(
+        seconds=backoff * 2 ** (outgoing.attempts - 1))
+
+
+def send_pending(batch_size=None, max_attempts=None, backoff=None):
+    """
+    Отправляет пачку готовых к отправке писем через одно соединение.
+    Неудачные письма, в том числе при ошибке открытия соединения,
+    откладываются с экспоненциально растущей паузой. Текст
+    отправленного письма стирается: в нём код подтверждения.
+    Возвращает число отправленных и неотправленных писем.
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    max_attempts = max_attempts or settings.OUTBOX_MAX_ATTEMPTS
+    backoff = backoff or settings.OUTBOX_RETRY_BACKOFF
+    batch = claim_batch(batch_size, max_attempts,
+                        settings.OUTBOX_CLAIM_TIMEOUT)
+    if not batch:
+        return 0, 0
+    sent = failed = 0
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        for outgoing in batch:
+            retry_later(outgoing, error, backoff)
+        failed = len(batch)
+    else:
+        try:
+            for outgoing in batch:
+                try:
+                    connection.send_messages([EmailMessage(
+                        subject=outgoing.subject,
+                        body=outgoing.message,
+                        from_email=outgoing.from_email,
+                        to=[outgoing.recipient],
+                    )])
+                except Exception as error:
+                    retry_later(outgoing, error, backoff)
+                    failed += 1
+                else:
+                    outgoing.sent_at = timezone.now()
+                    outgoing.message = ''
+                    outgoing.last_error = ''
+                    sent += 1
+        finally:
+            connection.close()
+    OutboxMessage.objects.bulk_update(
+        batch, ('sent_at', 'next_attempt_at', 'last_error', 'message'))
+    return sent, failed
+
+
+def purge_outbox(retention=None, max_attempts=None):
+    """
+    Удаляет отправленные письма и письма, исчерпавшие попытки,
+    старше retention секунд. Возвращает число удалённых писем.
+    """
+    retention = retention or settings.OUTBOX_RETENTION
+    max_attempts = max_attempts or settings.OUTBOX_MAX_ATTEMPTS
+    threshold = timezone.now() - timedelta(seconds=retention)
+    deleted, _ = OutboxMessage.objects.filter(
+        Q(sent_at__lt=threshold)
+        | Q(sent_at__isnull=True, attempts__gte=max_attempts,
+            created__lt=threshold)
+    ).delete()
+    return deleted
+
+
+def outbox_metrics(max_attempts=None, window=timedelta(hours=1),
+                   sample=1000):
+    """Глубина очереди, возраст старого письма и задержка отправки."""
+    max_attempts = max_attempts or settings.OUTBOX_MAX_ATTEMPTS
+    now = timezone.now()
+    pending = pending_messages(max_attempts)
+    oldest = pending.aggregate(oldest=Min('created'))['oldest']
+    latencies = sorted(
+        (sent_at - created).total_seconds()
+        for created, sent_at in OutboxMessage.objects.filter(
+            sent_at__gte=now - window,
+        ).order_by('-sent_at').values_list('created', 'sent_at')[:sample]
+    )
+    return {
+        'queue_depth': pending.count(),
+        'failed': OutboxMessage.objects.filter(
+            sent_at__isnull=True, attempts__gte=max_attempts).count(),
+        'oldest_pending_age': (now - oldest).total_seconds()
+        if oldest else 0,
+        'send_latency_avg': (sum(latencies) / len(latencies)
+                             if latencies else 0),
+        'send_latency_max': latencies[-1] if latencies else 0,
+    }
@@ -1,8 +1,127 @@
-from rest_framework import mixins, viewsets, filters
+from django.conf import settings
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response, parse_etags
+from django.utils.http import http_date
+from rest_framework import mixins, viewsets, filters, status
+from rest_framework.response import Response
+
+from api.cache import CATALOG_GENERATION_KEY, get_generation, make_etag
 from api.permissions import AdminOrReadOnly
+from api.rows import row_serializer
+
+
+class ResponseCacheMixin:
+    """
+    Кэширование ответов на чтение по URL с query string.
+    Ключ включает поколение каталога, поэтому запись
+    в каталог делает недействительными все ответы сразу.
+    """
+    cache_timeout = settings.CATALOG_CACHE_TIMEOUT
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        etag = make_etag(get_generation(CATALOG_GENERATION_KEY),
+                         request.accepted_media_type,
+                         request.get_full_path())
+        headers = {'ETag': etag}
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            return Response(status=status.HTTP_304_NOT_MODIFIED,
+                            headers=headers)
+        key = f'catalog:response:{etag}'
+        data = cache.get(key)
+        if data is not None:
+            return Response(data, headers=headers)
+        response = handler(request, *args, **kwargs)
+        if (isinstance(response, Response)
+                and response.status_code == status.HTTP_200_OK):
+            cache.set(key, response.data, self.cache_timeout)
+            response['ETag'] = etag
+        return response
+
+
+class CachedListMixin(ResponseCacheMixin):
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+
+class CachedRetrieveMixin(ResponseCacheMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs)
+
+
+class FastListMixin:
+    """
+    Список через RowSerializer: строки из values() без создания
+    моделей. Отключается настройкой FAST_LIST_SERIALIZATION.
+    """
 
+    def list(self, request, *args, **kwargs):
+        if not settings.FAST_LIST_SERIALIZATION:
+            return super().list(request, *args, **kwargs)
+        rows = row_serializer(self.get_serializer_class())
+        queryset = self.filter_queryset(self.get_queryset())
+        queryset = queryset.prefetch_related(None).values(*dict.fromkeys(
+            (*rows.paths, *getattr(self, 'cursor_ordering', ()))))
+        page = self.paginate_queryset(queryset)
+        if getattr(request.accepted_renderer, 'streaming', False):
+            return self.stream_list(rows, queryset, page)
+        if page is not None:
+            return self.get_paginated_response(
+                rows.serialize(queryset.model, page))
+        return Response(rows.serialize(queryset.model, list(queryset)))
 
-class CustomMixin(mixins.CreateModelMixin,
+    def stream_list(self, rows, queryset, page):
+        """
+        Потоковый ответ: строки сериализуются кусками по мере отправки,
+        без пагинации читаются из БД итератором.
+        """
+        data = rows.iter_serialize(
+            queryset.model, queryset.iterator() if page is None else page)
+        if page is not None:
+            envelope = self.get_paginated_response([]).data
+            envelope['results'] = data
+            data = envelope
+        renderer = self.request.accepted_renderer
+        return StreamingHttpResponse(renderer.stream(data),
+                                     content_type=renderer.media_type)
+
+
+class ConditionalListMixin:
+    """
+    Условный GET списка: ETag и Last-Modified по последней записи
+    журнала изменений. Вьюсет обязан определить `get_watermark`:
+    метод возвращает родительский объект из URL с аннотациями
+    `annotate_last_change`, так что проверка совмещена с его загрузкой.
+    Если клиент прислал совпадающий If-None-Match или не более старый
+    If-Modified-Since, ответ 304 отдаётся без выборки и сериализации
+    списка.
+    """
+
+    def list(self, request, *args, **kwargs):
+        watermark = self.get_watermark()
+        if watermark.last_change_id is None:
+            return super().list(request, *args, **kwargs)
+        last_modified = int(watermark.last_changed_at.timestamp())
+        headers = {
+            'ETag': make_etag(watermark.last_change_id,
+                              request.accepted_media_type,
+                              request.get_full_path()),
+            'Last-Modified': http_date(last_modified),
+        }
+        if get_conditional_response(request, etag=headers['ETag'],
+                                    last_modified=last_modified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED,
+                            headers=headers)
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            for header, value in headers.items():
+                response[header] = value
+        return response
+
+
+class CustomMixin(CachedListMixin,
+                  mixins.CreateModelMixin,
                   mixins.ListModelMixin,
                   mixins.DestroyModelMixin,
                   viewsets.GenericViewSet):
@@ -11,3 +130,29 @@ class CustomMixin(mixins.CreateModelMixin,
     permission_classes = (AdminOrReadOnly,)
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
+
+
+class QueryPlanMixin:
+    """
+    Миксин планирования запросов: для действий чтения подгружает
+    связанные объекты заранее и выбирает только сериализуемые колонки.
+    """
+    read_actions = ('list', 'retrieve')
+    select_related_fields = ()
+    prefetch_related_fields = ()
+    only_fields = ()
+
+    def plan_queryset(self, queryset):
+        if self.action not in self.read_actions:
+            return queryset
+        if self.select_related_fields:
+            queryset = queryset.select_related(*self.select_related_fields)
+        if self.prefetch_related_fields:
+            queryset = queryset.prefetch_related(
+                *self.prefetch_related_fields)
+        if self.only_fields:
+            queryset = queryset.only(*self.only_fields)
+        return queryset
+
+    def get_queryset(self):
+        return self.plan_queryset(super().get_queryset())
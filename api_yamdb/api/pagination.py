@@ -0,0 +1,64 @@
+from rest_framework.pagination import (BasePagination, CursorPagination,
+                                       PageNumberPagination)
+
+
+class LimitedPageSizeMixin:
+    """Размер страницы задаётся клиентом, но не больше максимума."""
+
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class NumberPagination(LimitedPageSizeMixin, PageNumberPagination):
+    """Постраничная пагинация по номеру страницы."""
+
+
+class KeysetPagination(LimitedPageSizeMixin, CursorPagination):
+    """
+    Курсорная пагинация по ключу сортировки вьюсета
+    без COUNT(*) и глубокого OFFSET.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        return getattr(view, 'cursor_ordering', self.ordering)
+
+
+class OptionalCursorPagination(BasePagination):
+    """
+    Пагинация по номеру страницы, курсорная — по запросу клиента
+    (`?pagination=cursor` или переданный `cursor`).
+    """
+
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+    page_number_class = NumberPagination
+    cursor_class = KeysetPagination
+
+    def __init__(self):
+        self.paginator = self.page_number_class()
+
+    def use_cursor(self, request):
+        return (request.query_params.get(self.mode_query_param)
+                == self.cursor_mode
+                or self.cursor_class.cursor_query_param
+                in request.query_params)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_cursor(request):
+            self.paginator = self.cursor_class()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.paginator.get_paginated_response_schema(schema)
+
+    def get_schema_fields(self, view):
+        return self.paginator.get_schema_fields(view)
+
+    def get_schema_operation_parameters(self, view):
+        return self.paginator.get_schema_operation_parameters(view)
+
+    def to_html(self):
+        return self.paginator.to_html()
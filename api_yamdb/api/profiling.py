@@ -0,0 +1,176 @@
+import threading
+import time
+from collections import Counter
+from functools import wraps
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from rest_framework import serializers
+
+from .rows import RowSerializer
+
+_local = threading.local()
+
+
+class RequestProfile:
+    """Замеры одного запроса."""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+        self.fingerprints = Counter()
+
+    def record_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - started
+            self.queries += 1
+            # SQL с плейсхолдерами без параметров — отпечаток запроса.
+            self.fingerprints[sql] += 1
+
+    @property
+    def duplicates(self):
+        return {sql: count for sql, count in self.fingerprints.items()
+                if count > 1}
+
+
+def timed_serialization(method):
+    """
+    Учитывает время внешнего вызова to_representation
+    или RowSerializer.serialize.
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        profile = getattr(_local, 'profile', None)
+        if profile is None or profile.serializer_depth:
+            return method(self, *args, **kwargs)
+        profile.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            profile.serializer_time += time.perf_counter() - started
+            profile.serializer_depth -= 1
+
+    wrapper.profiled = True
+    return wrapper
+
+
+def instrument_serializers():
+    for serializer_class in (serializers.Serializer,
+                             serializers.ListSerializer):
+        method = serializer_class.to_representation
+        if not getattr(method, 'profiled', False):
+            serializer_class.to_representation = timed_serialization(method)
+    if not getattr(RowSerializer.serialize, 'profiled', False):
+        RowSerializer.serialize = timed_serialization(RowSerializer.serialize)
+
+
+class ProfileStats:
+    """Агрегированные по маршрутам замеры в памяти процесса."""
+
+    buckets = (5, 10, 25, 50, 100, 250, 500, 1000)
+    top_duplicates = 10
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+
+    def record(self, route, profile, total_time):
+        total_ms = total_time * 1000
+        with self.lock:
+            entry = self.routes.setdefault(route, {
+                'requests': 0,
+                'queries': 0,
+                'sql_ms': 0.0,
+                'serializer_ms': 0.0,
+                'total_ms': 0.0,
+                'histogram': [0] * (len(self.buckets) + 1),
+                'duplicates': Counter(),
+            })
+            entry['requests'] += 1
+            entry['queries'] += profile.queries
+            entry['sql_ms'] += profile.sql_time * 1000
+            entry['serializer_ms'] += profile.serializer_time * 1000
+            entry['total_ms'] += total_ms
+            entry['histogram'][self.bucket(total_ms)] += 1
+            entry['duplicates'].update(profile.duplicates.keys())
+
+    def bucket(self, value):
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                return position
+        return len(self.buckets)
+
+    def snapshot(self):
+        labels = [f'<={bound}ms' for bound in self.buckets] + [
+            f'>{self.buckets[-1]}ms']
+        with self.lock:
+            return {
+                route: {
+                    'requests': entry['requests'],
+                    'avg_queries': round(
+                        entry['queries'] / entry['requests'], 2),
+                    'avg_sql_ms': round(
+                        entry['sql_ms'] / entry['requests'], 2),
+                    'avg_serializer_ms': round(
+                        entry['serializer_ms'] / entry['requests'], 2),
+                    'avg_total_ms': round(
+                        entry['total_ms'] / entry['requests'], 2),
+                    'histogram': dict(zip(labels, entry['histogram'])),
+                    'duplicate_queries': [
+                        {'sql': sql, 'requests': count}
+                        for sql, count in entry['duplicates'].most_common(
+                            self.top_duplicates)
+                    ],
+                }
+                for route, entry in self.routes.items()
+            }
+
+    def reset(self):
+        with self.lock:
+            self.routes.clear()
+
+
+stats = ProfileStats()
+
+
+class ProfilingMiddleware:
+    """
+    Профилирование запросов: число и время SQL-запросов, повторяющиеся
+    запросы, время сериализации и общее время по имени маршрута.
+    Включается настройкой PROFILING_ENABLED, иначе не подключается.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        instrument_serializers()
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        _local.profile = profile
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(profile.record_query):
+                response = self.get_response(request)
+        finally:
+            _local.profile = None
+        total_time = time.perf_counter() - started
+        match = request.resolver_match
+        route = (match.url_name or match.view_name) if match else 'unresolved'
+        stats.record(route, profile, total_time)
+        response['Server-Timing'] = ', '.join((
+            f'db;dur={profile.sql_time * 1000:.2f};'
+            f'desc="{profile.queries} queries"',
+            f'serializer;dur={profile.serializer_time * 1000:.2f}',
+            f'total;dur={total_time * 1000:.2f}',
+        ))
+        return response
@@ -0,0 +1,137 @@
+import csv
+import io
+
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+# Как и JSONRenderer, экранируем разделители строк для встраивания в JS.
+LINE_SEPARATORS = (
+    ('\u2028'.encode(), b'\\u2028'),
+    ('\u2029'.encode(), b'\\u2029'),
+)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer с кодировщиком orjson. Компактный вывод совпадает
+    с JSONRenderer; ответ с отступами (`Accept: ...; indent=N`) или
+    с ensure_ascii отдаётся стандартным кодировщиком.
+    """
+
+    options = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+               | orjson.OPT_PASSTHROUGH_DATACLASS)
+
+    def dumps(self, data):
+        ret = orjson.dumps(data, default=self.encoder_class().default,
+                           option=self.options)
+        for separator, escaped in LINE_SEPARATORS:
+            ret = ret.replace(separator, escaped)
+        return ret
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (self.ensure_ascii or not self.compact or self.get_indent(
+                accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+        return self.dumps(data)
+
+
+class StreamingJSONRenderer(FastJSONRenderer):
+    """
+    Потоковый вариант FastJSONRenderer: вьюсеты с FastListMixin отдают
+    список через StreamingHttpResponse, строки кодируются по одной
+    и отправляются кусками по buffer_size байт, тело ответа целиком
+    в памяти не собирается. Подключается в renderer_classes вьюсета
+    или в DEFAULT_RENDERER_CLASSES.
+    """
+
+    streaming = True
+    buffer_size = 64 * 1024
+
+    def stream(self, data):
+        buffer = bytearray()
+        for chunk in self.encode(data):
+            buffer += chunk
+            if len(buffer) >= self.buffer_size:
+                yield bytes(buffer)
+                buffer.clear()
+        if buffer:
+            yield bytes(buffer)
+
+    def encode(self, data):
+        """Объект или список, значения которого могут быть итераторами."""
+        if isinstance(data, dict):
+            yield b'{'
+            for position, (key, value) in enumerate(data.items()):
+                if position:
+                    yield b','
+                yield self.dumps(key) + b':'
+                yield from self.encode(value)
+            yield b'}'
+        elif not isinstance(data, (list, tuple)) and hasattr(
+                data, '__next__'):
+            yield b'['
+            for position, item in enumerate(data):
+                yield self.dumps(item) if not position else (
+                    b',' + self.dumps(item))
+            yield b']'
+        else:
+            yield self.dumps(data)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Выгрузка: по объекту JSON в строке."""
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+    buffer_size = 64 * 1024
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return FastJSONRenderer().dumps(data) + b'\n'
+
+    def stream(self, columns, records):
+        dumps = FastJSONRenderer().dumps
+        buffer = bytearray()
+        for record in records:
+            buffer += dumps(record) + b'\n'
+            if len(buffer) >= self.buffer_size:
+                yield bytes(buffer)
+                buffer.clear()
+        if buffer:
+            yield bytes(buffer)
+
+
+class CSVRenderer(BaseRenderer):
+    """Выгрузка в CSV с заголовком в раскладке static/data."""
+
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+    buffer_size = 64 * 1024
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        items = data.items() if isinstance(data, dict) else enumerate(data)
+        for key, value in items:
+            writer.writerow((key, value))
+        return buffer.getvalue().encode(self.charset)
+
+    def stream(self, columns, records):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(columns)
+        for record in records:
+            writer.writerow([record[column] for column in columns])
+            if buffer.tell() >= self.buffer_size:
+                yield buffer.getvalue().encode(self.charset)
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue().encode(self.charset)
@@ -0,0 +1,118 @@
+from collections import defaultdict
+from functools import lru_cache
+from itertools import islice
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+
+
+def identity(value):
+    return value
+
+
+def column(field, prefix):
+    """Путь в values() и функция приведения значения для поля DRF."""
+    if field.source == '*':
+        raise ImproperlyConfigured(
+            f'Поле {field.field_name} нельзя получить из values().')
+    path = prefix + field.source.replace('.', '__')
+    if isinstance(field, serializers.SlugRelatedField):
+        return f'{path}__{field.slug_field}', identity
+    if isinstance(field, serializers.RelatedField):
+        return path, identity
+    return path, field.to_representation
+
+
+def columns(serializer, prefix=''):
+    return [(name, *column(field, prefix))
+            for name, field in serializer.fields.items()
+            if not field.write_only]
+
+
+class RowSerializer:
+    """
+    Быстрая сериализация списков только для чтения. Строки берутся
+    из values() без создания моделей, значения приводятся теми же
+    полями DRF, что и у обычного сериализатора, поэтому JSON
+    совпадает побайтно. Вложенный сериализатор со many=True
+    загружается одним дополнительным запросом на страницу.
+    """
+
+    def __init__(self, serializer_class):
+        self.fields = []
+        self.paths = ['pk']
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.ListSerializer):
+                self.fields.append(
+                    (name, 'many', (field.source, columns(field.child))))
+            elif isinstance(field, serializers.BaseSerializer):
+                nested = columns(field, f'{field.source}__')
+                self.fields.append(
+                    (name, 'nested', (field.source, nested)))
+                self.paths.append(field.source)
+                self.paths.extend(path for _, path, _ in nested)
+            else:
+                path, convert = column(field, '')
+                self.fields.append((name, 'column', (path, convert)))
+                self.paths.append(path)
+        self.paths = list(dict.fromkeys(self.paths))
+
+    def load_many(self, model, rows):
+        """Значения вложенных списков для страницы: {поле: {pk: [...]}}."""
+        loaded = {}
+        pks = [row['pk'] for row in rows]
+        for name, kind, (source, nested) in self.fields:
+            if kind != 'many':
+                continue
+            related = model._meta.get_field(source).related_model
+            paths = [f'{source}__{path}' for _, path, _ in nested]
+            values = defaultdict(list)
+            for pk, *related_values in model.objects.filter(
+                pk__in=pks, **{f'{source}__isnull': False},
+            ).order_by(*(
+                f'{source}__{field}' for field in related._meta.ordering
+            )).values_list('pk', *paths):
+                values[pk].append({
+                    field_name: None if value is None else convert(value)
+                    for (field_name, _, convert), value in zip(
+                        nested, related_values)
+                })
+            loaded[name] = values
+        return loaded
+
+    def serialize(self, model, rows):
+        many = self.load_many(model, rows) if rows else {}
+        data = []
+        for row in rows:
+            item = {}
+            for name, kind, payload in self.fields:
+                if kind == 'column':
+                    path, convert = payload
+                    value = row[path]
+                    item[name] = None if value is None else convert(value)
+                elif kind == 'nested':
+                    source, nested = payload
+                    item[name] = None if row[source] is None else {
+                        field_name: None if row[path] is None
+                        else convert(row[path])
+                        for field_name, path, convert in nested
+                    }
+                else:
+                    item[name] = many[name].get(row['pk'], [])
+            data.append(item)
+        return data
+
+    def iter_serialize(self, model, rows, chunk_size=500):
+        """Сериализует строки кусками, в памяти не больше chunk_size."""
+        rows = iter(rows)
+        chunk = list(islice(rows, chunk_size))
+        while chunk:
+            yield from self.serialize(model, chunk)
+            chunk = list(islice(rows, chunk_size))
+
+
+@lru_cache(maxsize=None)
+def row_serializer(serializer_class):
+    return RowSerializer(serializer_class)
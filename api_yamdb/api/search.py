@@ -0,0 +1,230 @@
+import re
+from bisect import bisect_left, insort
+from threading import Lock
+
+from django.conf import settings
+from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                            SearchVector)
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Case, F, IntegerField, When
+
+from reviews.models import Title
+from .cache import TITLE_SEARCH_GENERATION_KEY, bump_generation, get_generation
+
+TOKEN_RE = re.compile(r'\w+')
+TITLE_SEARCH_CHANGES_KEY = 'titles:search:changes:{}'
+# Дальше этого отставания индекс в памяти перестраивается целиком.
+MAX_INCREMENTAL_CHANGES = 1000
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+def title_search_vector():
+    """Взвешенный tsvector: название важнее описания."""
+    config = settings.TITLE_SEARCH_CONFIG
+    return (SearchVector('name', weight='A', config=config)
+            + SearchVector('description', weight='B', config=config))
+
+
+class InvertedIndex:
+    """
+    Инвертированный индекс названий и описаний произведений
+    в памяти процесса. Используется, когда БД — не PostgreSQL.
+    Изменённые произведения переиндексируются по одному: их id
+    публикуются в общем кэше под номером поколения (mark_titles_changed).
+    Полная перестройка нужна только при первом поиске или если
+    цепочка изменений потеряна.
+    """
+
+    name_weight = 2
+    description_weight = 1
+
+    def __init__(self):
+        self.generation = None
+        self.documents = {}
+        self.postings = {}
+        self.tokens = []
+        self.lock = Lock()
+
+    def weights(self, name, description):
+        weights = {}
+        for weight, text in ((self.name_weight, name),
+                             (self.description_weight, description)):
+            for token in set(tokenize(text)):
+                weights[token] = weights.get(token, 0) + weight
+        return weights
+
+    def build(self, rows):
+        self.documents = {}
+        self.postings = {}
+        for pk, name, description in rows:
+            weights = self.weights(name, description)
+            self.documents[pk] = weights
+            for token, weight in weights.items():
+                self.postings.setdefault(token, {})[pk] = weight
+        self.tokens = sorted(self.postings)
+
+    def remove(self, pk):
+        for token in self.documents.pop(pk, ()):
+            bucket = self.postings[token]
+            del bucket[pk]
+            if not bucket:
+                del self.postings[token]
+                del self.tokens[bisect_left(self.tokens, token)]
+
+    def add(self, pk, name, description):
+        weights = self.weights(name, description)
+        self.documents[pk] = weights
+        for token, weight in weights.items():
+            if token not in self.postings:
+                self.postings[token] = {}
+                insort(self.tokens, token)
+            self.postings[token][pk] = weight
+
+    def update(self, pks):
+        """Переиндексирует произведения; удалённые убираются из индекса."""
+        for pk in pks:
+            self.remove(pk)
+        for pk, name, description in Title.objects.filter(
+                pk__in=pks).values_list('pk', 'name', 'description'):
+            self.add(pk, name, description)
+
+    def ensure_current(self):
+        generation = get_generation(TITLE_SEARCH_GENERATION_KEY)
+        if self.generation == generation:
+            return
+        with self.lock:
+            if self.generation == generation:
+                return
+            changed = changed_titles(self.generation, generation)
+            if changed is None:
+                self.build(Title.objects.values_list(
+                    'pk', 'name', 'description').iterator(chunk_size=2000))
+            else:
+                self.update(changed)
+            self.generation = generation
+
+    def lookup(self, prefix):
+        """Веса документов для всех слов индекса, начинающихся с prefix."""
+        scores = {}
+        for position in range(bisect_left(self.tokens, prefix),
+                              len(self.tokens)):
+            token = self.tokens[position]
+            if not token.startswith(prefix):
+                break
+            for pk, weight in self.postings[token].items():
+                scores[pk] = max(scores.get(pk, 0), weight)
+        return scores
+
+    def search(self, query, limit):
+        """id произведений, содержащих все слова запроса, по убыванию веса."""
+        self.ensure_current()
+        result = None
+        for token in set(tokenize(query)):
+            scores = self.lookup(token)
+            if result is None:
+                result = scores
+            else:
+                result = {pk: result[pk] + weight
+                          for pk, weight in scores.items() if pk in result}
+            if not result:
+                return []
+        if result is None:
+            return []
+        return sorted(result, key=lambda pk: (-result[pk], pk))[:limit]
+
+
+title_index = InvertedIndex()
+
+
+def changed_titles(old, new):
+    """
+    id произведений, изменённых между поколениями old и new, или None,
+    если какое-то из изменений не найдено в кэше и индекс нужно
+    перестроить целиком.
+    """
+    if old is None or not 0 < new - old <= MAX_INCREMENTAL_CHANGES:
+        return None
+    keys = [TITLE_SEARCH_CHANGES_KEY.format(generation)
+            for generation in range(old + 1, new + 1)]
+    changes = cache.get_many(keys)
+    if len(changes) != len(keys):
+        return None
+    return {pk for pks in changes.values() for pk in pks}
+
+
+def publish_changes(pks):
+    try:
+        generation = cache.incr(TITLE_SEARCH_GENERATION_KEY)
+    except ValueError:
+        # Поколения нет в кэше: новое значение заставит перестроить
+        # индексы целиком.
+        get_generation(TITLE_SEARCH_GENERATION_KEY)
+        return
+    cache.set(TITLE_SEARCH_CHANGES_KEY.format(generation), pks,
+              settings.TITLE_SEARCH_CHANGES_TIMEOUT)
+
+
+def mark_titles_changed(pks):
+    """
+    Сообщает индексам в памяти всех процессов, какие произведения
+    переиндексировать. Повторяется после фиксации транзакции, чтобы
+    процесс, прочитавший строки до неё, обновил их ещё раз.
+    """
+    pks = list(pks)
+    publish_changes(pks)
+    transaction.on_commit(lambda: publish_changes(pks))
+
+
+def search_query(query):
+    """
+    Запрос to_tsquery: все слова запроса как префиксы — так же,
+    как ищет индекс в памяти. None, если слов в запросе нет.
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return None
+    return SearchQuery(' & '.join(f'{token}:*' for token in tokens),
+                       config=settings.TITLE_SEARCH_CONFIG,
+                       search_type='raw')
+
+
+def search_titles(queryset, query):
+    """
+    Полнотекстовый поиск с сортировкой по релевантности. Слова запроса
+    ищутся как префиксы. Без PostgreSQL выдача ограничена
+    TITLE_SEARCH_MAX_RESULTS самыми релевантными произведениями.
+    """
+    if connection.vendor == 'postgresql':
+        tsquery = search_query(query)
+        if tsquery is None:
+            return queryset.none()
+        return queryset.filter(search_vector=tsquery).annotate(
+            rank=SearchRank(F('search_vector'), tsquery)
+        ).order_by('-rank', 'name', 'id')
+    ids = title_index.search(query, settings.TITLE_SEARCH_MAX_RESULTS)
+    if not ids:
+        return queryset.none()
+    return queryset.filter(pk__in=ids).order_by(Case(
+        *[When(pk=pk, then=position) for position, pk in enumerate(ids)],
+        output_field=IntegerField(),
+    ))
+
+
+def update_search_vectors(pks=None):
+    """
+    Пересчитывает поисковые векторы произведений pks (None — всех)
+    и обновляет индексы в памяти.
+    """
+    if connection.vendor == 'postgresql':
+        queryset = Title.objects.all()
+        if pks is not None:
+            queryset = queryset.filter(pk__in=pks)
+        queryset.update(search_vector=title_search_vector())
+    if pks is None:
+        bump_generation(TITLE_SEARCH_GENERATION_KEY)
+    else:
+        mark_titles_changed(pks)
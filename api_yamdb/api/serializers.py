@@ -1,10 +1,12 @@
 from django.core.exceptions import ValidationError
+from django.utils.encoding import smart_str
 from rest_framework import serializers
-from rest_framework.generics import get_object_or_404
 from rest_framework.validators import UniqueValidator
 from api_yamdb import settings
-from reviews.models import Category, Genre, Title, Review, Comments, User
+from reviews.models import (Category, Genre, Title, TitleStats, Review,
+                            Comments, User)
 from reviews.validators import validate_score, validate_year, validate_username
+from .dictionaries import slug_dictionary
 
 
 class ReviewSerializer(serializers.ModelSerializer):
@@ -24,13 +26,13 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Review
-        fields = '__all__'
+        exclude = ('updated_at',)
+        read_only_fields = ('comment_count',)
 
     def validate(self, data):
         request = self.context.get('request')
         if request.method == 'POST':
-            title_id = self.context.get('view').kwargs.get('title_id')
-            title = get_object_or_404(Title, pk=title_id)
+            title = self.context.get('view').get_title()
             if title.review.filter(author=request.user).exists():
                 raise ValidationError('Вы не можете добавить более'
                                       'одного отзыва на произведение')
@@ -45,7 +47,7 @@ class CommentsSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = '__all__'
+        exclude = ('updated_at',)
         model = Comments
         read_only_fields = ('review',)
 
@@ -75,20 +77,50 @@ class TitlesSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Title
-        fields = '__all__'
-        read_only_fields = ('genre', 'category', 'rating',)
+        exclude = ('score_sum', 'search_vector', 'updated_at')
+        read_only_fields = ('genre', 'category', 'rating', 'review_count')
+
+
+class TitleStatsSerializer(serializers.ModelSerializer):
+    """Сериализатор статистики отзывов произведения."""
+
+    title = serializers.IntegerField(source='title_id')
+    histogram = serializers.SerializerMethodField()
+    review_count = serializers.IntegerField(source='title.review_count')
+
+    class Meta:
+        model = TitleStats
+        fields = ('title', 'histogram', 'review_count', 'comment_count',
+                  'last_activity')
+
+    def get_histogram(self, obj):
+        return {str(score): count for score, count in obj.histogram.items()}
+
+
+class ClassificationSlugField(serializers.SlugRelatedField):
+    """Слаг категории или жанра, разрешаемый по словарю в памяти."""
+
+    def __init__(self, **kwargs):
+        super().__init__(slug_field='slug', **kwargs)
+
+    def to_internal_value(self, data):
+        try:
+            return slug_dictionary(self.get_queryset().model)[data]
+        except KeyError:
+            self.fail('does_not_exist', slug_name=self.slug_field,
+                      value=smart_str(data))
+        except TypeError:
+            self.fail('invalid')
 
 
 class TitleCreateSerializer(TitlesSerializer):
     """Сериализатор для модели тайтл. Для создания."""
 
-    genre = serializers.SlugRelatedField(
-        slug_field='slug',
+    genre = ClassificationSlugField(
         queryset=Genre.objects.all(),
         many=True,
     )
-    category = serializers.SlugRelatedField(
-        slug_field='slug',
+    category = ClassificationSlugField(
         queryset=Category.objects.all(),
     )
     year = serializers.IntegerField(
@@ -96,6 +128,36 @@ class TitleCreateSerializer(TitlesSerializer):
     )
 
 
+class TitleBulkItemSerializer(serializers.ModelSerializer):
+    """Сериализатор элемента пакетного создания тайтлов."""
+
+    genre = serializers.ListField(
+        child=serializers.SlugField(),
+        allow_empty=False,
+    )
+    category = serializers.SlugField()
+    year = serializers.IntegerField(
+        validators=[validate_year],
+    )
+
+    class Meta:
+        model = Title
+        fields = ('name', 'year', 'description', 'genre', 'category')
+
+
+class ReviewBulkItemSerializer(serializers.ModelSerializer):
+    """Сериализатор элемента пакетного создания отзывов."""
+
+    title = serializers.IntegerField()
+    score = serializers.IntegerField(
+        validators=[validate_score],
+    )
+
+    class Meta:
+        model = Review
+        fields = ('title', 'text', 'score')
+
+
 class UserCreateSerializer(serializers.Serializer):
     """Сериализатор для модели пользователь. Создание пользователя."""
 
@@ -0,0 +1,118 @@
+from collections import defaultdict
+
+from django.db.models import Count
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+
+from reviews.models import (Category, ChangeLogEntry, Comments, Genre,
+                            Review, Title, TitleStats, User)
+from .cache import (CATALOG_GENERATION_KEY, bump_generation_on_commit,
+                    classification_version_key, user_version_key)
+from .changes import (forget_review_titles, record_change,
+                      remember_review_titles)
+from .search import mark_titles_changed, update_search_vectors
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Review)
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_catalog_cache(sender, **kwargs):
+    bump_generation_on_commit(CATALOG_GENERATION_KEY)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Genre)
+def invalidate_slug_dictionary(sender, **kwargs):
+    bump_generation_on_commit(classification_version_key(sender))
+
+
+@receiver(post_save, sender=Title)
+def update_title_search_vector(sender, instance, **kwargs):
+    update_search_vectors([instance.pk])
+
+
+@receiver(post_delete, sender=Title)
+def invalidate_title_search_index(sender, instance, **kwargs):
+    mark_titles_changed([instance.pk])
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    bump_generation_on_commit(user_version_key(instance.pk))
+
+
+@receiver(pre_delete, sender=User)
+def release_author_counters(sender, instance, **kwargs):
+    """
+    Удаление пользователя каскадом удаляет его отзывы, их комментарии
+    и его комментарии к чужим отзывам. Счётчики остающихся отзывов,
+    произведений и статистики произведений уменьшаются заранее,
+    в той же транзакции, что и удаление.
+    """
+    scores = defaultdict(dict)
+    comments = defaultdict(int)
+    review_comments = {}
+    review_titles = {}
+    for title, review, total in (
+            Comments.objects.filter(author=instance)
+            .exclude(review__author=instance).order_by()
+            .values('review__title', 'review').annotate(total=Count('pk'))
+            .values_list('review__title', 'review', 'total')):
+        review_comments[review] = -total
+        review_titles[review] = title
+        comments[title] -= total
+    remember_review_titles(review_titles)
+    instance._review_titles = review_titles
+    if review_comments:
+        Review.apply_comment_counts(review_comments)
+    titles = {}
+    for title, score, total, comments_total in (
+            Review.objects.filter(author=instance).order_by()
+            .values('title', 'score')
+            .annotate(total=Count('pk', distinct=True),
+                      comments=Count('comments'))
+            .values_list('title', 'score', 'total', 'comments')):
+        score_sum, count = titles.get(title, (0, 0))
+        titles[title] = (score_sum - score * total, count - total)
+        scores[title][score] = -total
+        comments[title] -= comments_total
+    if titles:
+        Title.apply_scores(titles)
+    for title in scores.keys() | comments.keys():
+        TitleStats.apply(title, scores.get(title), comments.get(title, 0))
+
+
+@receiver(post_delete, sender=User)
+def forget_author_review_titles(sender, instance, **kwargs):
+    forget_review_titles(getattr(instance, '_review_titles', ()))
+
+
+@receiver(pre_delete, sender=Review)
+def remember_review_title(sender, instance, **kwargs):
+    remember_review_titles({instance.pk: instance.title_id})
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_save, sender=Comments)
+def log_saved_feedback(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        record_change(instance, ChangeLogEntry.CREATED if created
+                      else ChangeLogEntry.UPDATED)
+
+
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Comments)
+def log_deleted_feedback(sender, instance, **kwargs):
+    record_change(instance, ChangeLogEntry.DELETED)
+    if sender is Review:
+        forget_review_titles([instance.pk])
@@ -0,0 +1,158 @@
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+REJECTED_KEY = 'throttle:rejected:{}'
+# Корзина читается и записывается под блокировкой в общем кэше
+# (cache.add атомарен): параллельные запросы не тратят один токен
+# дважды. Блокировка снимается сама через BUCKET_LOCK_TIMEOUT секунд.
+BUCKET_LOCK_TIMEOUT = 1
+BUCKET_LOCK_ATTEMPTS = 20
+BUCKET_LOCK_DELAY = 0.005
+
+# Быстрый путь в памяти процесса: ключ -> момент, до которого корзина
+# заведомо пуста. Повторные запросы в это время отклоняются без
+# обращения к общему кэшу. Словарь упорядочен по времени блокировки.
+_blocked = {}
+_blocked_lock = threading.Lock()
+MAX_BLOCKED_KEYS = 10000
+
+
+def parse_rate(rate):
+    """'5/m' -> (ёмкость корзины, период пополнения в секундах)."""
+    capacity, period = rate.split('/')
+    return int(capacity), PERIODS[period[0]]
+
+
+def reset():
+    with _blocked_lock:
+        _blocked.clear()
+
+
+def rejected_counts():
+    """Число отклонённых запросов по областям из DEFAULT_THROTTLE_RATES."""
+    scopes = list(api_settings.DEFAULT_THROTTLE_RATES)
+    counts = cache.get_many([REJECTED_KEY.format(scope) for scope in scopes])
+    return {scope: counts.get(REJECTED_KEY.format(scope), 0)
+            for scope in scopes}
+
+
+def block(key, until, now):
+    """
+    Запоминает пустую корзину. Когда словарь заполнен, удаляются
+    истёкшие блокировки, а если их нет — самая старая.
+    """
+    with _blocked_lock:
+        _blocked.pop(key, None)
+        if len(_blocked) >= MAX_BLOCKED_KEYS:
+            for expired in [blocked for blocked, blocked_until
+                            in _blocked.items() if blocked_until <= now]:
+                del _blocked[expired]
+        while len(_blocked) >= MAX_BLOCKED_KEYS:
+            del _blocked[next(iter(_blocked))]
+        _blocked[key] = until
+
+
+@contextmanager
+def bucket_lock(key):
+    """Блокировка корзины в общем кэше; False, если не получена."""
+    lock_key = f'{key}:lock'
+    for _ in range(BUCKET_LOCK_ATTEMPTS):
+        if cache.add(lock_key, 1, BUCKET_LOCK_TIMEOUT):
+            break
+        time.sleep(BUCKET_LOCK_DELAY)
+    else:
+        yield False
+        return
+    try:
+        yield True
+    finally:
+        cache.delete(lock_key)
+
+
+def record_rejection(scope):
+    key = REJECTED_KEY.format(scope)
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Ограничение частоты корзиной токенов: ёмкость и скорость пополнения
+    задаются в DEFAULT_THROTTLE_RATES по области вьюсета
+    (`throttle_scope`) и суффиксу класса. Ключ корзины возвращает
+    `get_ident_key` подкласса. Состояние корзин хранится в общем кэше,
+    отказы учитываются счётчиками в нём же.
+    """
+
+    suffix = ''
+
+    def allow_request(self, request, view):
+        self.wait_time = None
+        scope = getattr(view, 'throttle_scope', None)
+        if scope is None:
+            return True
+        self.scope = scope + self.suffix
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        ident = self.get_ident_key(request)
+        if rate is None or not ident:
+            return True
+        capacity, period = parse_rate(rate)
+        key = 'throttle:{}:{}'.format(
+            self.scope, hashlib.md5(ident.encode()).hexdigest())
+        now = time.time()
+        blocked_until = _blocked.get(key)
+        if blocked_until is not None and now < blocked_until:
+            return self.reject(blocked_until - now)
+        with bucket_lock(key) as locked:
+            if not locked:
+                # Корзину держат параллельные запросы того же клиента.
+                return self.reject(period / capacity)
+            now = time.time()
+            tokens, updated = cache.get(key, (capacity, now))
+            tokens = min(capacity,
+                         tokens + (now - updated) * capacity / period)
+            if tokens >= 1:
+                cache.set(key, (tokens - 1, now), period)
+                return True
+        wait = (1 - tokens) * period / capacity
+        block(key, now + wait, now)
+        return self.reject(wait)
+
+    def reject(self, wait):
+        self.wait_time = wait
+        record_rejection(self.scope)
+        return False
+
+    def wait(self):
+        return self.wait_time
+
+
+class IPThrottle(TokenBucketThrottle):
+    """Корзина на IP-адрес клиента."""
+
+    def get_ident_key(self, request):
+        return self.get_ident(request)
+
+
+class UsernameThrottle(TokenBucketThrottle):
+    """Корзина на имя пользователя из тела запроса."""
+
+    suffix = '_username'
+
+    def get_ident_key(self, request):
+        if not hasattr(request.data, 'get'):
+            return None
+        username = request.data.get('username')
+        if isinstance(username, str):
+            return username.strip().lower()
+        return None
@@ -2,7 +2,8 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
 from .views import (CategoryViewSet, GenreViewSet, TitleViewSet,
-                    ReviewViewSet, CommentsViewSet, UserViewSet)
+                    ReviewViewSet, CommentsViewSet, UserViewSet,
+                    ProfilingStats, BulkReviews, Export, ChangeFeed)
 
 router = DefaultRouter()
 router.register(r'categories', CategoryViewSet, basename='categories')
@@ -18,4 +19,8 @@ router.register('users', UserViewSet, basename='User')
 urlpatterns = [
     path('v1/', include(router.urls)),
     path('v1/auth/', include('api.inner')),
+    path('v1/reviews/bulk/', BulkReviews.as_view(), name='reviews-bulk'),
+    path('v1/profiling/', ProfilingStats.as_view(), name='profiling'),
+    path('v1/export/<str:dataset>/', Export.as_view(), name='export'),
+    path('v1/changes/', ChangeFeed.as_view(), name='changes'),
 ]
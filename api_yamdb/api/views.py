@@ -1,27 +1,41 @@
+from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db import IntegrityError
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from rest_framework import viewsets, status, filters
+from rest_framework import viewsets, status, filters, serializers
 
-from .mixin import CustomMixin
+from .mixin import (CachedListMixin, CachedRetrieveMixin,
+                    ConditionalListMixin, CustomMixin, FastListMixin,
+                    QueryPlanMixin)
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import (AllowAny, IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import AccessToken
 
-from reviews.models import Category, Genre, Title, Review, User
-from .filters import TitleFilter
+from reviews.models import Category, Genre, Title, TitleStats, Review, User
+from .bulk import batch_status, create_reviews, create_titles
+from .changes import annotate_last_change, changes_after
+from .connections import stats as connection_stats
+from .export import DATASETS, export_columns, export_records
+from .filters import LeaderboardFilter, TitleFilter
+from .mail import enqueue_mail
+from .pagination import OptionalCursorPagination
+from .profiling import stats
+from .renderers import CSVRenderer, NDJSONRenderer
 from .permissions import (AuthorOrModeratorOrAdmin,
                           AdminOrReadOnly, IsAdmin)
+from .throttling import IPThrottle, UsernameThrottle, rejected_counts
 from .serializers import (CategorySerializer, GenreSerializer,
                           TitlesSerializer, ReviewSerializer,
                           CommentsSerializer, TitleCreateSerializer,
                           UserCreateSerializer, GetTokenSerializer,
-                          UserSerializer, UpdateUserSerializer)
+                          UserSerializer, UpdateUserSerializer,
+                          TitleStatsSerializer)
 
 
 class CategoryViewSet(CustomMixin):
@@ -38,60 +52,256 @@ class GenreViewSet(CustomMixin):
     serializer_class = GenreSerializer
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(CachedRetrieveMixin, CachedListMixin, FastListMixin,
+                   QueryPlanMixin, viewsets.ModelViewSet):
     """API для работы произведений."""
-    queryset = Title.objects.annotate(
-        rating=Avg('review__score')
+    queryset = Title.objects.all()
+    select_related_fields = ('category',)
+    prefetch_related_fields = (
+        Prefetch('genre', queryset=Genre.objects.only('name', 'slug')),
     )
+    only_fields = ('id', 'name', 'year', 'description', 'rating',
+                   'review_count', 'category', 'category__name',
+                   'category__slug')
     permission_classes = (AdminOrReadOnly,)
     filterset_class = TitleFilter
     serializer_class = TitlesSerializer
     ordering_fields = ('name',)
+    pagination_class = OptionalCursorPagination
+    cursor_ordering = ('name', 'id')
+    read_actions = ('list', 'retrieve', 'top')
 
     def get_serializer_class(self):
-        if self.action in ['list', 'retrieve']:
+        if self.action in self.read_actions:
             return TitlesSerializer
         return TitleCreateSerializer
 
+    @action(detail=False, methods=['get'], url_path='top')
+    def top(self, request):
+        """
+        Топ произведений по рейтингу: общий, по категории, жанру
+        или году. Рейтинг поддерживается при записи отзывов,
+        поэтому топ читается диапазоном по индексу рейтинга.
+        """
+        return self.cached_response(self.top_titles, request)
+
+    def top_titles(self, request):
+        limit = serializers.IntegerField(
+            min_value=1, max_value=settings.LEADERBOARD_MAX_SIZE,
+        ).run_validation(request.query_params.get(
+            'limit', settings.LEADERBOARD_MAX_SIZE))
+        params = request.query_params.copy()
+        params.setdefault('min_reviews', settings.LEADERBOARD_MIN_REVIEWS)
+        filterset = LeaderboardFilter(params, queryset=self.get_queryset())
+        if not filterset.is_valid():
+            raise serializers.ValidationError(filterset.errors)
+        titles = filterset.qs.filter(
+            rating__isnull=False,
+        ).order_by('-rating', 'id')[:limit]
+        return Response(self.get_serializer(titles, many=True).data)
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        results = create_titles(request.data)
+        return Response(results, status=batch_status(results))
+
+    @action(detail=True, methods=['get'], url_path='stats')
+    def stats(self, request, pk=None):
+        title = get_object_or_404(
+            Title.objects.select_related('stats'), pk=pk)
+        try:
+            stats = title.stats
+        except TitleStats.DoesNotExist:
+            stats = TitleStats(title=title)
+        return Response(TitleStatsSerializer(stats).data)
+
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ConditionalListMixin, FastListMixin, QueryPlanMixin,
+                    viewsets.ModelViewSet):
     """API для работы отзывов."""
 
     serializer_class = ReviewSerializer
     permission_classes = (
         AuthorOrModeratorOrAdmin, IsAuthenticatedOrReadOnly,)
+    pagination_class = OptionalCursorPagination
+    cursor_ordering = ('pub_date', 'id')
+    select_related_fields = ('author', 'title')
+    only_fields = ('id', 'text', 'score', 'pub_date', 'comment_count',
+                   'author', 'author__username', 'title', 'title__name')
 
     def get_title(self):
-        return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
+        """
+        Произведение из URL, загружается один раз за запрос
+        вместе с водяным знаком журнала изменений.
+        """
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                annotate_last_change(Title.objects.all(), 'title_id'),
+                pk=self.kwargs.get('title_id'))
+        return self._title
+
+    get_watermark = get_title
 
     def get_queryset(self):
-        return self.get_title().review.all()
+        return self.plan_queryset(self.get_title().review.all())
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, title=self.get_title())
-
-
-class CommentsViewSet(viewsets.ModelViewSet):
+        title = self.get_title()
+        with transaction.atomic():
+            review = serializer.save(author=self.request.user, title=title)
+            Title.apply_score(title.pk, review.score, 1)
+            TitleStats.apply(title.pk, {review.score: 1})
+
+    def locked_score(self, review):
+        """
+        Оценка отзыва из БД под блокировкой строки до конца транзакции:
+        параллельные изменения одного отзыва применяют разницу оценок
+        по очереди. None, если отзыв уже удалён.
+        """
+        return Review.objects.select_for_update().filter(
+            pk=review.pk).values_list('score', flat=True).first()
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            old_score = self.locked_score(serializer.instance)
+            if old_score is None:
+                raise NotFound()
+            review = serializer.save()
+            Title.apply_score(review.title_id, review.score - old_score)
+            scores = {}
+            if review.score != old_score:
+                scores = {old_score: -1, review.score: 1}
+            TitleStats.apply(review.title_id, scores)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            score = self.locked_score(instance)
+            if score is None:
+                raise NotFound()
+            comments = instance.comments.count()
+            instance.delete()
+            Title.apply_score(instance.title_id, -score, -1)
+            TitleStats.apply(instance.title_id, {score: -1}, -comments)
+
+
+class CommentsViewSet(ConditionalListMixin, FastListMixin, QueryPlanMixin,
+                      viewsets.ModelViewSet):
     """API для работы комментариев."""
 
     serializer_class = CommentsSerializer
     permission_classes = (
         AuthorOrModeratorOrAdmin, IsAuthenticatedOrReadOnly,)
+    pagination_class = OptionalCursorPagination
+    cursor_ordering = ('pub_date', 'id')
+    select_related_fields = ('author',)
+    only_fields = ('id', 'text', 'pub_date', 'review', 'author',
+                   'author__username')
 
     def get_review(self):
-        return get_object_or_404(Review, id=self.kwargs.get('review_id'))
+        """
+        Отзыв из URL, загружается один раз за запрос вместе
+        с водяным знаком журнала изменений и только если он
+        относится к произведению из того же URL.
+        """
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                annotate_last_change(Review.objects.all(), 'review_id'),
+                id=self.kwargs.get('review_id'),
+                title_id=self.kwargs.get('title_id'),
+            )
+        return self._review
+
+    get_watermark = get_review
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        return self.plan_queryset(self.get_review().comments.all())
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, review=self.get_review())
+        review = self.get_review()
+        with transaction.atomic():
+            serializer.save(author=self.request.user, review=review)
+            Review.apply_comment_count(review.pk, 1)
+            TitleStats.apply(review.title_id, comments=1)
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            serializer.save()
+            TitleStats.apply(self.get_review().title_id)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            Review.apply_comment_count(instance.review_id, -1)
+            TitleStats.apply(self.get_review().title_id, comments=-1)
+
+
+class BulkReviews(APIView):
+    """API для пакетного создания отзывов на разные произведения."""
+
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request):
+        results = create_reviews(request.user, request.data)
+        return Response(results, status=batch_status(results))
+
+
+class Export(APIView):
+    """API потоковой выгрузки каталога в NDJSON или CSV."""
+
+    permission_classes = (IsAdmin,)
+    renderer_classes = (NDJSONRenderer, CSVRenderer)
+
+    def get(self, request, dataset):
+        if dataset not in DATASETS:
+            raise NotFound('Неизвестный набор данных.')
+        since = request.query_params.get('updated_since')
+        if since is not None:
+            since = serializers.DateTimeField().run_validation(since)
+        renderer = request.accepted_renderer
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+        response = StreamingHttpResponse(
+            renderer.stream(export_columns(dataset),
+                            export_records(dataset, since)),
+            content_type=content_type,
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{dataset}.{renderer.format}"')
+        return response
+
+
+class ChangeFeed(APIView):
+    """
+    API ленты изменений отзывов и комментариев после курсора
+    (`?cursor=`), можно ограничить одним произведением (`?title=`).
+    """
+
+    permission_classes = (AllowAny,)
+
+    def get(self, request):
+        params = request.query_params
+        cursor = serializers.IntegerField(min_value=0).run_validation(
+            params.get('cursor', 0))
+        limit = serializers.IntegerField(
+            min_value=1, max_value=settings.CHANGE_FEED_MAX_LIMIT,
+        ).run_validation(params.get('limit', settings.CHANGE_FEED_MAX_LIMIT))
+        title_id = params.get('title')
+        if title_id is not None:
+            title_id = serializers.IntegerField().run_validation(title_id)
+        changes = changes_after(cursor, limit, title_id)
+        return Response({
+            'cursor': changes[-1]['cursor'] if changes else cursor,
+            'results': changes,
+        })
 
 
 class RegistrationNewUser(APIView):
     """API для работы регистрации пользователей."""
 
     permission_classes = (AllowAny,)
+    throttle_classes = (IPThrottle, UsernameThrottle)
+    throttle_scope = 'signup'
 
     def post(self, request):
         serializer = UserCreateSerializer(data=request.data)
@@ -104,11 +314,10 @@ class RegistrationNewUser(APIView):
             return Response('Email либо username занят, укажите другой.',
                             status.HTTP_400_BAD_REQUEST)
         confirmation_code = default_token_generator.make_token(user)
-        send_mail(
+        enqueue_mail(
             subject='Регистрация на сайте',
             message=f'токен для входа на сайт: {confirmation_code}',
-            from_email=None,
-            recipient_list=[user.email],
+            recipient=user.email,
         )
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -117,6 +326,8 @@ class GetToken(APIView):
     """API для получения токена."""
 
     permission_classes = (AllowAny,)
+    throttle_classes = (IPThrottle, UsernameThrottle)
+    throttle_scope = 'token'
     serializer_class = GetTokenSerializer
 
     def post(self, request):
@@ -154,7 +365,9 @@ class UserViewSet(viewsets.ModelViewSet):
             )
     def me(self, request):
         global serializer
-        user = self.request.user
+        # Пользователь запроса из кэша аутентификации содержит только
+        # поля для проверки прав, профиль загружается из БД.
+        user = User.objects.get(pk=self.request.user.pk)
         if request.method == 'GET':
             serializer = UserSerializer(user)
         elif request.method == 'PATCH':
@@ -163,3 +376,22 @@ class UserViewSet(viewsets.ModelViewSet):
             serializer.is_valid(raise_exception=True)
             serializer.save()
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class ProfilingStats(APIView):
+    """API для просмотра агрегированных замеров профилирования."""
+
+    permission_classes = (IsAdmin,)
+
+    def get(self, request):
+        return Response({
+            'enabled': settings.PROFILING_ENABLED,
+            'routes': stats.snapshot(),
+            'connections': connection_stats.snapshot(),
+            'throttled': rejected_counts(),
+        })
+
+    def delete(self, request):
+        stats.reset()
+        connection_stats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -35,8 +35,12 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.profiling.ProfilingMiddleware',
 ]
 
+# Профилирование запросов (заголовок Server-Timing и /api/v1/profiling/)
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', default='False') == 'True'
+
 ROOT_URLCONF = 'api_yamdb.urls'
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
@@ -65,10 +69,44 @@ DATABASES = {
         'USER': os.getenv('POSTGRES_USER', default='postgres'),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', default='postgres'),
         'HOST': os.getenv('DB_HOST', default='db'),
-        'PORT': os.getenv('DB_PORT', default='5432')
+        'PORT': os.getenv('DB_PORT', default='5432'),
+        # Постоянные соединения: каждый воркер переиспользует своё
+        # соединение CONN_MAX_AGE секунд, 0 — соединение на запрос.
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', default=60)),
+        # Для пулера в режиме transaction (pgbouncer) серверные
+        # курсоры нужно отключить.
+        'DISABLE_SERVER_SIDE_CURSORS': os.getenv(
+            'DB_DISABLE_SERVER_SIDE_CURSORS', default='False') == 'True',
+    }
+}
+
+# Простоявшее дольше стольких секунд постоянное соединение
+# проверяется перед выдачей запросу.
+DB_HEALTH_CHECK_INTERVAL = int(
+    os.getenv('DB_HEALTH_CHECK_INTERVAL', default=30))
+
+# Кэш должен быть общим для всех воркеров (в docker-compose — memcached):
+# gunicorn не запустит несколько воркеров с LocMemCache.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', default='yamdb'),
     }
 }
 
+# Время жизни закэшированных ответов каталога, секунды
+CATALOG_CACHE_TIMEOUT = int(os.getenv('CATALOG_CACHE_TIMEOUT', default=300))
+
+# Поиск по произведениям: конфигурация PostgreSQL full-text search.
+# Для остальных СУБД поиск идёт по индексу в памяти, и выдача
+# ограничена TITLE_SEARCH_MAX_RESULTS самыми релевантными
+# произведениями; изменения произведений хранятся в кэше
+# TITLE_SEARCH_CHANGES_TIMEOUT секунд для обновления индексов.
+TITLE_SEARCH_CONFIG = 'russian'
+TITLE_SEARCH_MAX_RESULTS = int(
+    os.getenv('TITLE_SEARCH_MAX_RESULTS', default=300))
+TITLE_SEARCH_CHANGES_TIMEOUT = 3600
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -109,11 +147,29 @@ REST_FRAMEWORK = {
     ],
 
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
     ],
+    # Потоковый вывод списков: api.renderers.StreamingJSONRenderer.
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    # Число доверенных прокси перед приложением: адрес клиента берётся
+    # из X-Forwarded-For, который выставляет nginx.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', default=1)),
+    # Корзины токенов регистрации и получения токена: ёмкость/период
+    # на IP-адрес и на имя пользователя (api.throttling).
+    'DEFAULT_THROTTLE_RATES': {
+        'signup': os.getenv('THROTTLE_SIGNUP', default='10/m'),
+        'signup_username': os.getenv(
+            'THROTTLE_SIGNUP_USERNAME', default='3/m'),
+        'token': os.getenv('THROTTLE_TOKEN', default='20/m'),
+        'token_username': os.getenv(
+            'THROTTLE_TOKEN_USERNAME', default='5/m'),
+    },
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 5,
 }
@@ -130,6 +186,13 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Время жизни пользователя в кэше аутентификации, секунды
+USER_CACHE_TIMEOUT = 60
+
+# Время жизни словарей категорий и жанров в памяти процесса, секунды.
+# Страховка на случай отката транзакции после смены версии.
+CLASSIFICATION_CACHE_TIMEOUT = 300
+
 # Ограничения полей моделей
 
 USERS_USERNAME_MAX_LENGTH = 150
@@ -143,3 +206,37 @@ CLASSIFICATION_SLUG_MAX_LENGTH = 50
 TITLE_NAME_MAX_LENGTH = 256
 
 FEEDBACK_TEXT_MAX_LENGTH = 250
+
+OUTBOX_SUBJECT_MAX_LENGTH = 255
+
+# Максимальный размер пакета в пакетных эндпоинтах
+BULK_MAX_ITEMS = 100
+
+# Списки произведений, отзывов и комментариев сериализуются из values()
+# без создания моделей; False — обычные сериализаторы DRF.
+FAST_LIST_SERIALIZATION = os.getenv(
+    'FAST_LIST_SERIALIZATION', default='True') == 'True'
+
+# Выгрузка каталога: строк за одно чтение из серверного курсора.
+EXPORT_CHUNK_SIZE = 2000
+
+# Лента изменений: наибольший размер ответа и задержка, после которой
+# запись журнала считается зафиксированной.
+CHANGE_FEED_MAX_LIMIT = 500
+CHANGE_FEED_SETTLE_SECONDS = 1
+
+# Рейтинги произведений: минимальное число отзывов по умолчанию
+# и наибольший размер топа.
+LEADERBOARD_MIN_REVIEWS = 1
+LEADERBOARD_MAX_SIZE = 100
+
+# Очередь исходящих писем
+
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_BACKOFF = 30
+# Через столько секунд забранное воркером, но не отправленное письмо
+# снова попадает в очередь.
+OUTBOX_CLAIM_TIMEOUT = 300
+# Отправленные и исчерпавшие попытки письма хранятся столько секунд.
+OUTBOX_RETENTION = int(os.getenv('OUTBOX_RETENTION', default=7 * 86400))
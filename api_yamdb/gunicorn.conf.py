@@ -0,0 +1,32 @@
+import multiprocessing
+import os
+
+# Профиль запуска задаётся переменными окружения:
+# синхронные воркеры (по умолчанию) или воркеры с потоками
+# (GUNICORN_WORKER_CLASS=gthread, GUNICORN_THREADS).
+
+bind = os.getenv('GUNICORN_BIND', '0:8000')
+workers = int(os.getenv('GUNICORN_WORKERS',
+                        multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'sync')
+threads = int(os.getenv('GUNICORN_THREADS', 1))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+
+
+def on_starting(server):
+    """
+    Кэш пользователей, поколения каталога и корзины ограничения частоты
+    должны быть общими для воркеров: с LocMemCache у каждого воркера
+    своя копия, и изменения не видны остальным.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    from django.conf import settings
+
+    backend = settings.CACHES['default']['BACKEND']
+    if server.cfg.workers > 1 and backend.endswith('LocMemCache'):
+        raise RuntimeError(
+            'LocMemCache нельзя использовать с несколькими воркерами: '
+            'укажите общий кэш в CACHE_BACKEND и CACHE_LOCATION '
+            'или запустите один воркер (GUNICORN_WORKERS=1).')
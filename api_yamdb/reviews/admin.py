@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from .models import Review, Comments, User, Category, Genre, Title
+from .models import (Review, Comments, User, Category, Genre, Title,
+                     OutboxMessage)
 
 
 @admin.register(User)
@@ -93,3 +94,21 @@ class TitleAdmin(admin.ModelAdmin):
         'description',
     )
     empty_value_display = '-пусто-'
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'recipient',
+        'subject',
+        'created',
+        'attempts',
+        'sent_at',
+    )
+    list_filter = ('sent_at',)
+    # Текст письма содержит код подтверждения.
+    exclude = ('message',)
+    readonly_fields = ('subject', 'from_email', 'recipient', 'created',
+                       'attempts', 'sent_at', 'last_error')
+    empty_value_display = '-пусто-'
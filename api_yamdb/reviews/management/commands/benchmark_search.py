@@ -0,0 +1,93 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api.search import search_titles, update_search_vectors
+from reviews.models import Title
+
+SYLLABLES = ('ка', 'ро', 'ли', 'на', 'те', 'мо', 'ска', 'вер', 'дон', 'пу',
+             'лан', 'ти', 'ор', 'бе', 'зал', 'ми', 'сан', 'го', 'ре', 'ша')
+
+
+def make_vocabulary(rng, size):
+    return sorted({
+        ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        for _ in range(size)
+    })
+
+
+def measure(func, queries):
+    timings = []
+    for query in queries:
+        started = time.perf_counter()
+        func(query)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return (statistics.mean(timings),
+            timings[int(len(timings) * 0.95) - 1 if len(timings) > 1 else 0])
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает поиск по подстроке (icontains) и полнотекстовый '
+            'поиск на синтетическом наборе произведений. Данные '
+            'создаются в транзакции и откатываются после замера. '
+            'Запускается только на базе без произведений.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=1000000)
+        parser.add_argument('--queries', type=int, default=50)
+        parser.add_argument('--page-size', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        # Поисковые векторы пересчитываются по всей таблице: на рабочей
+        # базе это заблокировало бы все произведения на время замера.
+        if Title.objects.exists():
+            raise CommandError(
+                'В базе уже есть произведения: запустите бенчмарк '
+                'на пустой базе.')
+        rng = random.Random(options['seed'])
+        vocabulary = make_vocabulary(rng, 5000)
+        queries = [rng.choice(vocabulary) for _ in range(options['queries'])]
+        page_size = options['page_size']
+
+        def substring(query):
+            queryset = Title.objects.filter(name__icontains=query)
+            queryset.count()
+            list(queryset[:page_size])
+
+        def ranked(query):
+            queryset = search_titles(Title.objects.all(), query)
+            queryset.count()
+            list(queryset[:page_size])
+
+        with transaction.atomic():
+            started = time.monotonic()
+            self.seed(rng, vocabulary, options['titles'])
+            update_search_vectors()
+            self.stdout.write(
+                f'Создано {options["titles"]} произведений за '
+                f'{time.monotonic() - started:.1f} с')
+            # Первый поиск строит индекс в памяти, в замер он не входит.
+            ranked(queries[0])
+            for label, func in (('icontains', substring),
+                                ('search', ranked)):
+                mean, p95 = measure(func, queries)
+                self.stdout.write(
+                    f'{label:>10}: среднее {mean:.1f} мс, p95 {p95:.1f} мс')
+            transaction.set_rollback(True)
+        update_search_vectors()
+
+    def seed(self, rng, vocabulary, count, batch_size=10000):
+        for start in range(0, count, batch_size):
+            Title.objects.bulk_create(
+                Title(
+                    name=' '.join(rng.sample(vocabulary, 3)).capitalize(),
+                    description=' '.join(rng.sample(vocabulary, 12)),
+                    year=rng.randint(1900, 2020),
+                )
+                for _ in range(min(batch_size, count - start))
+            )
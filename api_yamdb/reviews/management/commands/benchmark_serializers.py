@@ -0,0 +1,95 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Prefetch
+
+from api.rows import row_serializer
+from api.serializers import (CommentsSerializer, ReviewSerializer,
+                             TitlesSerializer)
+from reviews.models import Category, Comments, Genre, Review, Title, User
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает скорость сериализации списков (строк в секунду) '
+            'сериализаторами DRF и через RowSerializer. Данные создаются '
+            'в транзакции и откатываются после замера.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        count = options['rows']
+        with transaction.atomic():
+            title, review = self.seed(count)
+            cases = (
+                ('titles', TitlesSerializer, Title.objects.filter(
+                    category=title.category_id,
+                ).select_related(
+                    'category').prefetch_related(Prefetch(
+                        'genre', queryset=Genre.objects.only('name', 'slug'),
+                    ))),
+                ('reviews', ReviewSerializer, title.review.select_related(
+                    'author', 'title')),
+                ('comments', CommentsSerializer, review.comments
+                 .select_related('author')),
+            )
+            for label, serializer_class, queryset in cases:
+                rows = row_serializer(serializer_class)
+                regular = self.measure(
+                    lambda: serializer_class(queryset.all(), many=True).data,
+                    options['repeat'])
+                fast = self.measure(
+                    lambda: rows.serialize(queryset.model, list(
+                        queryset.prefetch_related(None).values(*rows.paths))),
+                    options['repeat'])
+                self.stdout.write(
+                    f'{label:>9}: DRF {count / regular:9.0f} строк/с, '
+                    f'values() {count / fast:9.0f} строк/с, '
+                    f'ускорение {regular / fast:.1f}x'
+                )
+            transaction.set_rollback(True)
+
+    def measure(self, func, repeat):
+        """Лучшее время из repeat прогонов, с."""
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    def seed(self, count):
+        category = Category.objects.create(name='Бенчмарк', slug='bench-cat')
+        Genre.objects.bulk_create(
+            Genre(name=f'Бенчмарк {i}', slug=f'bench-genre-{i}')
+            for i in range(3)
+        )
+        Title.objects.bulk_create(
+            Title(name=f'Бенчмарк {i}', year=2000, category=category,
+                  rating=5.5)
+            for i in range(count)
+        )
+        titles = list(Title.objects.filter(category=category))
+        genres = list(Genre.objects.filter(slug__startswith='bench-genre-'))
+        Title.genre.through.objects.bulk_create(
+            Title.genre.through(title_id=title.pk, genre_id=genre.pk)
+            for title in titles for genre in genres
+        )
+        User.objects.bulk_create(
+            User(username=f'bench{i}', email=f'bench{i}@yamdb.fake')
+            for i in range(count)
+        )
+        users = list(User.objects.filter(username__startswith='bench'))
+        title = titles[0]
+        Review.objects.bulk_create(
+            Review(title=title, author=user, text='Отзыв', score=7)
+            for user in users
+        )
+        review = title.review.first()
+        Comments.objects.bulk_create(
+            Comments(review=review, author=user, text='Комментарий')
+            for user in users
+        )
+        return title, review
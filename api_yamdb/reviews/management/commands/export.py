@@ -0,0 +1,56 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from api.export import DATASETS, export_columns, export_records
+from api.renderers import CSVRenderer, NDJSONRenderer
+
+RENDERERS = {renderer.format: renderer
+             for renderer in (CSVRenderer, NDJSONRenderer)}
+
+
+class Command(BaseCommand):
+    help = ('Выгружает каталог в CSV (раскладка static/data, пригодна '
+            'для import_csv) или NDJSON, читая БД серверным курсором.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'datasets',
+            nargs='*',
+            help=f'Наборы данных: {", ".join(DATASETS)}. По умолчанию все.',
+        )
+        parser.add_argument('--format', choices=list(RENDERERS),
+                            default='csv')
+        parser.add_argument('--output', default='.',
+                            help='Каталог для файлов выгрузки.')
+        parser.add_argument(
+            '--updated-since',
+            help='Только записи, изменённые начиная с этого момента '
+                 '(ISO 8601).',
+        )
+        parser.add_argument('--chunk-size', type=int)
+
+    def handle(self, *args, **options):
+        since = None
+        if options['updated_since']:
+            since = parse_datetime(options['updated_since'])
+            if since is None:
+                raise CommandError('Неверный формат --updated-since.')
+        unknown = set(options['datasets']) - set(DATASETS)
+        if unknown:
+            raise CommandError(
+                f'Неизвестные наборы данных: {", ".join(sorted(unknown))}.')
+        renderer = RENDERERS[options['format']]()
+        os.makedirs(options['output'], exist_ok=True)
+        for dataset in options['datasets'] or DATASETS:
+            path = os.path.join(options['output'],
+                                f'{dataset}.{renderer.format}')
+            with open(path, 'wb') as output:
+                for chunk in renderer.stream(
+                    export_columns(dataset),
+                    export_records(dataset, since, options['chunk_size']),
+                ):
+                    output.write(chunk)
+            self.stdout.write(f'{dataset}: {path}')
+        self.stdout.write(self.style.SUCCESS('Выгрузка завершена.'))
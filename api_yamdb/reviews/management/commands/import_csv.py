@@ -0,0 +1,166 @@
+import csv
+import io
+import os
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from api.search import update_search_vectors
+from reviews.models import Category, Comments, Genre, Review, Title, User
+
+# Порядок загрузки учитывает внешние ключи между таблицами.
+SOURCES = (
+    ('users.csv', User, {}),
+    ('category.csv', Category, {}),
+    ('genre.csv', Genre, {}),
+    ('titles.csv', Title, {'category': 'category_id'}),
+    ('genre_title.csv', Title.genre.through, {}),
+    ('review.csv', Review, {'author': 'author_id'}),
+    ('comments.csv', Comments, {'author': 'author_id'}),
+)
+
+
+def read_rows(path):
+    """Построчно читает CSV-файл, не загружая его в память целиком."""
+    with open(path, encoding='utf-8', newline='') as csv_file:
+        yield from csv.DictReader(csv_file)
+
+
+def build_objects(model, rows, columns):
+    """Превращает строки CSV в несохранённые экземпляры модели."""
+    for row in rows:
+        values = {}
+        for column, raw in row.items():
+            name = columns.get(column, column)
+            field = model._meta.get_field(name)
+            if raw == '' and field.null:
+                values[field.attname] = None
+            else:
+                values[field.attname] = field.to_python(raw)
+        yield model(**values)
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    batch = list(islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(islice(iterator, size))
+
+
+@contextmanager
+def preserve_auto_now_add(model):
+    """Не даёт bulk_create подменить даты из файла текущим временем."""
+    fields = [field for field in model._meta.concrete_fields
+              if getattr(field, 'auto_now_add', False)]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def copy_rows(model, objects):
+    """
+    Строки COPY для пачки объектов. Значения берутся через pre_save,
+    как при bulk_create, чтобы заполнились поля auto_now.
+    """
+    fields = model._meta.concrete_fields
+    for obj in objects:
+        yield [
+            r'\N' if value is None else value
+            for value in (
+                field.get_db_prep_save(field.pre_save(obj, add=True),
+                                       connection)
+                for field in fields
+            )
+        ]
+
+
+def copy_batch(cursor, model, objects):
+    """Быстрая загрузка пачки через COPY (только PostgreSQL)."""
+    fields = model._meta.concrete_fields
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(copy_rows(model, objects))
+    buffer.seek(0)
+    quote = connection.ops.quote_name
+    cursor.copy_expert(
+        'COPY {table} ({columns}) FROM STDIN '
+        "WITH (FORMAT csv, NULL '\\N')".format(
+            table=quote(model._meta.db_table),
+            columns=', '.join(quote(field.column) for field in fields),
+        ),
+        buffer,
+    )
+
+
+class Command(BaseCommand):
+    help = 'Загружает данные из CSV-файлов static/data в базу данных.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=os.path.join(settings.BASE_DIR, 'static', 'data'),
+            help='Каталог с CSV-файлами.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Число строк в одной пачке вставки.',
+        )
+        parser.add_argument(
+            '--no-copy',
+            action='store_true',
+            help='Не использовать COPY даже на PostgreSQL.',
+        )
+
+    def handle(self, *args, **options):
+        use_copy = (connection.vendor == 'postgresql'
+                    and not options['no_copy'])
+        for filename, model, columns in SOURCES:
+            path = os.path.join(options['path'], filename)
+            if not os.path.exists(path):
+                raise CommandError(f'Файл {path} не найден.')
+            started = time.monotonic()
+            total = self.load(model, build_objects(
+                model, read_rows(path), columns),
+                options['batch_size'], use_copy)
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f'{filename}: {total} строк за {elapsed:.2f} с '
+                f'({total / elapsed if elapsed else total:.0f} строк/с)'
+            )
+        self.reset_sequences()
+        update_search_vectors()
+        call_command('rebuild_counters', stdout=self.stdout)
+        call_command('rebuild_stats', stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS('Импорт завершён.'))
+
+    def load(self, model, objects, batch_size, use_copy):
+        total = 0
+        with transaction.atomic(), preserve_auto_now_add(model):
+            with connection.cursor() as cursor:
+                for batch in batched(objects, batch_size):
+                    if use_copy:
+                        copy_batch(cursor, model, batch)
+                    else:
+                        model.objects.bulk_create(batch)
+                    total += len(batch)
+        return total
+
+    def reset_sequences(self):
+        """После вставки с явными id сдвигает последовательности ключей."""
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), [model for _, model, _ in SOURCES])
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
@@ -0,0 +1,109 @@
+import threading
+import time
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+
+def percentile(ordered, fraction):
+    if not ordered:
+        return 0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class Command(BaseCommand):
+    help = ('Нагрузочный тест запущенного сервера: пропускная способность '
+            'и задержки при разном числе одновременных клиентов. '
+            'Запускается одинаково для любого профиля gunicorn.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://localhost:8000')
+        parser.add_argument(
+            '--path',
+            action='append',
+            dest='paths',
+            help='Путь запроса, можно указать несколько раз.',
+        )
+        parser.add_argument(
+            '--concurrency',
+            default='1,8,32,64',
+            help='Уровни числа клиентов через запятую.',
+        )
+        parser.add_argument('--duration', type=float, default=10)
+        parser.add_argument(
+            '--latency-target',
+            type=float,
+            default=200,
+            help='Целевой p95, мс.',
+        )
+        parser.add_argument('--token', help='JWT для заголовка Bearer.')
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or ['/api/v1/titles/']
+        headers = {}
+        if options['token']:
+            headers['Authorization'] = f'Bearer {options["token"]}'
+        best = None
+        for concurrency in map(int, options['concurrency'].split(',')):
+            latencies, errors = self.run(
+                options['url'], paths, headers, concurrency,
+                options['duration'])
+            if not latencies:
+                raise CommandError('Ни один запрос не выполнен успешно.')
+            latencies.sort()
+            rps = len(latencies) / options['duration']
+            p95 = percentile(latencies, 0.95)
+            self.stdout.write(
+                f'клиентов {concurrency:>4}: {rps:8.1f} запр/с, '
+                f'p50 {percentile(latencies, 0.5):7.1f} мс, '
+                f'p95 {p95:7.1f} мс, '
+                f'p99 {percentile(latencies, 0.99):7.1f} мс, '
+                f'ошибок {errors}'
+            )
+            if p95 <= options['latency_target'] and (
+                    best is None or rps > best[1]):
+                best = (concurrency, rps)
+        if best is None:
+            self.stdout.write(self.style.WARNING(
+                f'Цель p95 <= {options["latency_target"]} мс '
+                'не достигнута ни на одном уровне.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'При p95 <= {options["latency_target"]} мс: '
+                f'{best[1]:.1f} запр/с ({best[0]} клиентов).'))
+
+    def run(self, url, paths, headers, concurrency, duration):
+        latencies = []
+        errors = []
+        deadline = time.monotonic() + duration
+
+        def client(number):
+            session = requests.Session()
+            session.headers.update(headers)
+            own_latencies = []
+            own_errors = 0
+            step = number
+            while time.monotonic() < deadline:
+                path = paths[step % len(paths)]
+                step += 1
+                started = time.perf_counter()
+                try:
+                    response = session.get(url + path, timeout=30)
+                except requests.RequestException:
+                    own_errors += 1
+                    continue
+                if response.status_code >= 400:
+                    own_errors += 1
+                    continue
+                own_latencies.append(
+                    (time.perf_counter() - started) * 1000)
+            latencies.extend(own_latencies)
+            errors.append(own_errors)
+
+        threads = [threading.Thread(target=client, args=(number,))
+                   for number in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return latencies, sum(errors)
@@ -0,0 +1,48 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from reviews.models import Comments, Review
+
+
+def actual_comment_count():
+    """Подзапрос с фактическим числом комментариев для каждого отзыва."""
+    return Coalesce(
+        Subquery(Comments.objects.filter(review=OuterRef('pk')).order_by()
+                 .values('review').annotate(total=Count('pk'))
+                 .values('total'),
+                 output_field=IntegerField()),
+        0)
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает денормализованные счётчики: число комментариев '
+            'отзывов и число отзывов произведений (через rebuild_ratings).')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить расхождения, ничего не изменяя.',
+        )
+
+    def handle(self, *args, **options):
+        drifted = Review.objects.annotate(
+            actual_count=actual_comment_count(),
+        ).filter(~Q(comment_count=F('actual_count')))
+        if options['check']:
+            count = drifted.count()
+            if count:
+                raise CommandError(
+                    f'Число комментариев расходится у {count} отзывов.')
+            call_command('rebuild_ratings', check=True, stdout=self.stdout)
+            return
+        with transaction.atomic():
+            updated = Review.objects.filter(
+                pk__in=drifted.values('pk'),
+            ).update(comment_count=actual_comment_count())
+        self.stdout.write(self.style.SUCCESS(
+            f'Исправлено отзывов: {updated}.'))
+        call_command('rebuild_ratings', stdout=self.stdout)
@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import (Count, F, FloatField, IntegerField, OuterRef,
+                              Q, Subquery, Sum, Value)
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+from api.cache import CATALOG_GENERATION_KEY, bump_generation
+from reviews.models import Review, Title
+
+
+def rating_aggregates():
+    """Подзапросы с фактическими агрегатами отзывов для каждого тайтла."""
+    reviews = (Review.objects.filter(title=OuterRef('pk'))
+               .order_by().values('title'))
+    return {
+        'actual_sum': Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total'),
+                     output_field=IntegerField()),
+            0),
+        'actual_count': Coalesce(
+            Subquery(reviews.annotate(total=Count('pk')).values('total'),
+                     output_field=IntegerField()),
+            0),
+    }
+
+
+def actual_rating():
+    """Рейтинг по той же формуле, что и в Title.apply_scores."""
+    return (Cast(F('actual_sum'), FloatField())
+            / NullIf(F('actual_count'), Value(0)))
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает денормализованные рейтинг, число отзывов '
+            'и сумму оценок произведений.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить расхождения, ничего не изменяя.',
+        )
+
+    def handle(self, *args, **options):
+        drifted = Title.objects.annotate(
+            **rating_aggregates(),
+        ).annotate(
+            actual_rating=actual_rating(),
+        ).filter(
+            ~Q(score_sum=F('actual_sum'))
+            | ~Q(review_count=F('actual_count'))
+            | Q(rating__isnull=True, actual_count__gt=0)
+            | Q(rating__isnull=False, actual_count=0)
+            | ~Q(rating=F('actual_rating'))
+        )
+        if options['check']:
+            count = drifted.count()
+            if count:
+                raise CommandError(
+                    f'Рейтинг расходится с отзывами у {count} произведений.')
+            self.stdout.write(self.style.SUCCESS('Расхождений нет.'))
+            return
+        aggregates = rating_aggregates()
+        with transaction.atomic():
+            updated = Title.objects.update(
+                score_sum=aggregates['actual_sum'],
+                review_count=aggregates['actual_count'],
+                rating=(Cast(aggregates['actual_sum'], FloatField())
+                        / NullIf(aggregates['actual_count'], Value(0))),
+            )
+        bump_generation(CATALOG_GENERATION_KEY)
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитано произведений: {updated}.'))
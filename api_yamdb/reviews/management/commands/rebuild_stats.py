@@ -0,0 +1,90 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import (Count, F, IntegerField, Max, OuterRef, Q,
+                              Subquery)
+from django.db.models.functions import Coalesce, Greatest
+
+from reviews.models import Comments, Review, Title, TitleStats
+
+COUNTERS = [f'score_{score}' for score in TitleStats.SCORES] + [
+    'comment_count']
+
+
+def count_of(queryset):
+    return Coalesce(
+        Subquery(queryset.annotate(total=Count('pk')).values('total'),
+                 output_field=IntegerField()),
+        0)
+
+
+def stats_aggregates():
+    """Подзапросы с фактическими счётчиками для каждой строки статистики."""
+    reviews = (Review.objects.filter(title=OuterRef('title_id'))
+               .order_by().values('title'))
+    comments = (Comments.objects.filter(review__title=OuterRef('title_id'))
+                .order_by().values('review__title'))
+    return dict(
+        {f'actual_score_{score}': count_of(reviews.filter(score=score))
+         for score in TitleStats.SCORES},
+        actual_comment_count=count_of(comments),
+    )
+
+
+def last_activity():
+    """Время последнего отзыва или комментария, если оно ещё не известно."""
+    last_review = Subquery(
+        Review.objects.filter(title=OuterRef('title_id')).order_by()
+        .values('title').annotate(last=Max('pub_date')).values('last'))
+    last_comment = Subquery(
+        Comments.objects.filter(review__title=OuterRef('title_id'))
+        .order_by().values('review__title')
+        .annotate(last=Max('pub_date')).values('last'))
+    return Coalesce(F('last_activity'), Greatest(
+        Coalesce(last_review, last_comment),
+        Coalesce(last_comment, last_review)))
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает гистограммы оценок, число комментариев '
+            'и время последней активности произведений.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить расхождения, ничего не изменяя.',
+        )
+
+    def handle(self, *args, **options):
+        missing = Title.objects.filter(
+            review__isnull=False, stats__isnull=True,
+        ).order_by().values_list('pk', flat=True).distinct()
+        drifted = TitleStats.objects.annotate(**stats_aggregates()).filter(
+            Q(*(~Q(**{counter: F(f'actual_{counter}')})
+                for counter in COUNTERS), _connector=Q.OR))
+        if options['check']:
+            count = missing.count() + drifted.count()
+            if count:
+                raise CommandError(
+                    f'Статистика расходится у произведений: {count}.')
+            return
+        with transaction.atomic():
+            # Пачками по pk, без курсора, открытого во время вставки.
+            batch = list(missing.order_by('pk')[:options['batch_size']])
+            while batch:
+                TitleStats.objects.bulk_create(
+                    [TitleStats(title_id=title_id) for title_id in batch],
+                    ignore_conflicts=True)
+                batch = list(missing.filter(pk__gt=batch[-1]).order_by(
+                    'pk')[:options['batch_size']])
+            aggregates = stats_aggregates()
+            updated = TitleStats.objects.filter(
+                pk__in=drifted.values('pk'),
+            ).update(
+                last_activity=last_activity(),
+                **{counter: aggregates[f'actual_{counter}']
+                   for counter in COUNTERS},
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Исправлена статистика произведений: {updated}.'))
@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.mail import outbox_metrics, purge_outbox, send_pending
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди исходящих пачками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Отправить готовые письма и завершиться.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза между проверками пустой очереди, секунды.',
+        )
+        parser.add_argument('--batch-size', type=int)
+        parser.add_argument(
+            '--stats',
+            action='store_true',
+            help='Только вывести метрики очереди.',
+        )
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.write_metrics()
+            return
+        while True:
+            started = time.monotonic()
+            sent, failed = send_pending(batch_size=options['batch_size'])
+            if sent or failed:
+                self.stdout.write(
+                    f'Отправлено {sent}, с ошибкой {failed} '
+                    f'за {time.monotonic() - started:.2f} с')
+                continue
+            purged = purge_outbox()
+            if purged:
+                self.stdout.write(f'Удалено старых писем: {purged}')
+            if options['once']:
+                break
+            time.sleep(options['interval'])
+        self.write_metrics()
+
+    def write_metrics(self):
+        for name, value in outbox_metrics().items():
+            self.stdout.write(f'{name}: {value}')
@@ -0,0 +1,73 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:40
+
+from django.db import migrations, models
+from django.db.models import (Count, FloatField, IntegerField, OuterRef,
+                              Subquery, Sum, Value)
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+
+def fill_ratings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    reviews = (Review.objects.filter(title=OuterRef('pk'))
+               .order_by().values('title'))
+    score_sum = Coalesce(
+        Subquery(reviews.annotate(total=Sum('score')).values('total'),
+                 output_field=IntegerField()),
+        0)
+    review_count = Coalesce(
+        Subquery(reviews.annotate(total=Count('pk')).values('total'),
+                 output_field=IntegerField()),
+        0)
+    Title.objects.update(
+        score_sum=score_sum,
+        review_count=review_count,
+        rating=(Cast(score_sum, FloatField())
+                / NullIf(review_count, Value(0))),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='category',
+            options={'ordering': ('name',), 'verbose_name': 'Категория', 'verbose_name_plural': 'Категории'},
+        ),
+        migrations.AlterModelOptions(
+            name='comments',
+            options={'default_related_name': 'comments', 'ordering': ('pub_date',), 'verbose_name': 'Комментарий', 'verbose_name_plural': 'Комментарии'},
+        ),
+        migrations.AlterModelOptions(
+            name='genre',
+            options={'ordering': ('name',), 'verbose_name': 'Жанр', 'verbose_name_plural': 'Жанры'},
+        ),
+        migrations.AlterModelOptions(
+            name='review',
+            options={'default_related_name': 'review', 'ordering': ('pub_date',), 'verbose_name': 'Отзыв', 'verbose_name_plural': 'Отзывы'},
+        ),
+        migrations.AlterModelOptions(
+            name='title',
+            options={'ordering': ('name',), 'verbose_name': 'Произведение', 'verbose_name_plural': 'Произведения'},
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(blank=True, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
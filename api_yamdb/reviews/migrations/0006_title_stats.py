@@ -0,0 +1,75 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:52
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+import django.db.models.deletion
+
+
+def fill_title_stats(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    Comments = apps.get_model('reviews', 'Comments')
+    TitleStats = apps.get_model('reviews', 'TitleStats')
+    titles = Title.objects.filter(review__isnull=False).order_by(
+        'pk').values_list('pk', flat=True).distinct()
+    batch = list(titles[:1000])
+    while batch:
+        TitleStats.objects.bulk_create(
+            [TitleStats(title_id=title_id) for title_id in batch])
+        batch = list(titles.filter(pk__gt=batch[-1])[:1000])
+
+    def count_of(queryset):
+        return Coalesce(
+            Subquery(queryset.annotate(total=Count('pk')).values('total'),
+                     output_field=IntegerField()),
+            0)
+
+    reviews = (Review.objects.filter(title=OuterRef('title_id'))
+               .order_by().values('title'))
+    comments = (Comments.objects.filter(review__title=OuterRef('title_id'))
+                .order_by().values('review__title'))
+    last_review = Subquery(
+        reviews.annotate(last=Max('pub_date')).values('last'))
+    last_comment = Subquery(
+        comments.annotate(last=Max('pub_date')).values('last'))
+    TitleStats.objects.update(
+        comment_count=count_of(comments),
+        last_activity=Greatest(Coalesce(last_review, last_comment),
+                               Coalesce(last_comment, last_review)),
+        **{f'score_{score}': count_of(reviews.filter(score=score))
+           for score in range(1, 11)},
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_outbox_message'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleStats',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='reviews.Title', verbose_name='Произведение')),
+                ('score_1', models.PositiveIntegerField(default=0, verbose_name='Число оценок 1')),
+                ('score_2', models.PositiveIntegerField(default=0, verbose_name='Число оценок 2')),
+                ('score_3', models.PositiveIntegerField(default=0, verbose_name='Число оценок 3')),
+                ('score_4', models.PositiveIntegerField(default=0, verbose_name='Число оценок 4')),
+                ('score_5', models.PositiveIntegerField(default=0, verbose_name='Число оценок 5')),
+                ('score_6', models.PositiveIntegerField(default=0, verbose_name='Число оценок 6')),
+                ('score_7', models.PositiveIntegerField(default=0, verbose_name='Число оценок 7')),
+                ('score_8', models.PositiveIntegerField(default=0, verbose_name='Число оценок 8')),
+                ('score_9', models.PositiveIntegerField(default=0, verbose_name='Число оценок 9')),
+                ('score_10', models.PositiveIntegerField(default=0, verbose_name='Число оценок 10')),
+                ('comment_count', models.PositiveIntegerField(default=0, verbose_name='Количество комментариев')),
+                ('last_activity', models.DateTimeField(blank=True, null=True, verbose_name='Последняя активность')),
+            ],
+            options={
+                'verbose_name': 'Статистика произведения',
+                'verbose_name_plural': 'Статистика произведений',
+            },
+        ),
+        migrations.RunPython(fill_title_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 2.2.16 on 2026-10-18 06:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_title_rating_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogEntry',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('model', models.CharField(choices=[('review', 'review'), ('comment', 'comment')], max_length=16, verbose_name='Модель')),
+                ('action', models.CharField(choices=[('created', 'created'), ('updated', 'updated'), ('deleted', 'deleted')], max_length=16, verbose_name='Действие')),
+                ('object_id', models.PositiveIntegerField(verbose_name='Id объекта')),
+                ('title_id', models.PositiveIntegerField(verbose_name='Id произведения')),
+                ('payload', models.TextField(blank=True, verbose_name='Данные объекта (JSON)')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата изменения')),
+            ],
+            options={
+                'verbose_name': 'Запись журнала изменений',
+                'verbose_name_plural': 'Журнал изменений',
+                'ordering': ('id',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='changelogentry',
+            index=models.Index(fields=['title_id', 'id'], name='changelog_title_id_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 2.2.16 on 2026-10-18 06:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_change_log'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comments',
+            index=models.Index(fields=['author', 'pub_date'], name='comments_author_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['author', 'pub_date'], name='review_author_pub_date_idx'),
+        ),
+        # Автоматическая промежуточная таблица жанров не принимает
+        # Meta.indexes: индекс для фильтра по жанру создаётся вручную.
+        migrations.RunSQL(
+            'CREATE INDEX title_genre_genre_title_idx '
+            'ON reviews_title_genre (genre_id, title_id)',
+            'DROP INDEX title_genre_genre_title_idx',
+        ),
+    ]
@@ -0,0 +1,55 @@
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+import django.utils.timezone
+
+
+def fill_updated_at(apps, schema_editor):
+    for model_name in ('Review', 'Comments'):
+        apps.get_model('reviews', model_name).objects.update(
+            updated_at=F('pub_date'))
+
+
+def fill_review_id(apps, schema_editor):
+    ChangeLogEntry = apps.get_model('reviews', 'ChangeLogEntry')
+    Comments = apps.get_model('reviews', 'Comments')
+    ChangeLogEntry.objects.filter(model='review').update(
+        review_id=F('object_id'))
+    # Для удалённых комментариев отзыв уже не восстановить.
+    ChangeLogEntry.objects.filter(model='comment').update(
+        review_id=Coalesce(Subquery(Comments.objects.filter(
+            pk=OuterRef('object_id')).values('review_id')[:1]), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_feedback_author_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comments',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Дата изменения'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Дата изменения'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_updated_at, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='changelogentry',
+            name='review_id',
+            field=models.PositiveIntegerField(default=0, verbose_name='Id отзыва'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_review_id, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='changelogentry',
+            index=models.Index(fields=['review_id', 'id'], name='changelog_review_id_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_comment_count(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Comments = apps.get_model('reviews', 'Comments')
+    Review.objects.update(comment_count=Coalesce(Subquery(
+        Comments.objects.filter(review=OuterRef('pk')).order_by()
+        .values('review').annotate(total=Count('pk')).values('total'),
+        output_field=IntegerField()), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_feedback_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество комментариев'),
+        ),
+        migrations.RunPython(fill_comment_count, migrations.RunPython.noop),
+    ]
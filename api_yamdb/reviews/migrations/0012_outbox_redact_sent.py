@@ -0,0 +1,17 @@
+from django.db import migrations
+
+
+def redact_sent(apps, schema_editor):
+    OutboxMessage = apps.get_model('reviews', 'OutboxMessage')
+    OutboxMessage.objects.filter(sent_at__isnull=False).update(message='')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_review_comment_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(redact_sent, migrations.RunPython.noop),
+    ]
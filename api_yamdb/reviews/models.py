@@ -1,5 +1,11 @@
+from collections import defaultdict
+
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Cast, NullIf
+from django.utils import timezone
 
 from api_yamdb import settings
 from .validators import validate_year, validate_score
@@ -143,15 +149,77 @@ class Title(models.Model):
         null=True,
         verbose_name='Категория',
     )
+    rating = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name='Рейтинг',
+    )
+    review_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество отзывов',
+    )
+    score_sum = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Сумма оценок',
+    )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        verbose_name='Поисковый вектор',
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения',
+    )
 
     class Meta:
         ordering = ('name',)
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(fields=['name', 'id'], name='title_name_id_idx'),
+            # Индексы рейтингов: топ читается диапазоном по индексу.
+            models.Index(fields=['-rating', 'id'], name='title_rating_idx'),
+            models.Index(fields=['category', '-rating', 'id'],
+                         name='title_category_rating_idx'),
+            models.Index(fields=['year', '-rating', 'id'],
+                         name='title_year_rating_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def apply_score(cls, pk, score_delta, count_delta=0):
+        """Изменяет рейтинг одного произведения, см. apply_scores."""
+        return cls.apply_scores({pk: (score_delta, count_delta)})
+
+    @classmethod
+    def apply_scores(cls, deltas):
+        """
+        Атомарно изменяет сумму оценок и число отзывов произведений
+        и пересчитывает их рейтинг одним UPDATE. Рейтинг выгружается
+        вместе с произведением, поэтому обновляется и дата изменения.
+        deltas: {pk: (изменение суммы оценок, изменение числа отзывов)}.
+        """
+        def per_title(position):
+            return Case(
+                *[When(pk=pk, then=Value(delta[position]))
+                  for pk, delta in deltas.items()],
+                default=Value(0),
+                output_field=models.IntegerField(),
+            )
+
+        score_sum = F('score_sum') + per_title(0)
+        review_count = F('review_count') + per_title(1)
+        return cls.objects.filter(pk__in=deltas).update(
+            score_sum=score_sum,
+            review_count=review_count,
+            rating=(Cast(score_sum, FloatField())
+                    / NullIf(review_count, Value(0))),
+            updated_at=timezone.now(),
+        )
+
 
 class Feedback(models.Model):
     """Абстрактная модель обратной связи от пользователей"""
@@ -169,6 +237,10 @@ class Feedback(models.Model):
         auto_now_add=True,
         verbose_name='Дата добавления',
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения',
+    )
 
     class Meta:
         abstract = True
@@ -188,6 +260,10 @@ class Review(Feedback):
         default=1,
         verbose_name='Оценка',
     )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество комментариев',
+    )
 
     class Meta(Feedback.Meta):
         default_related_name = 'review'
@@ -199,6 +275,31 @@ class Review(Feedback):
                 name='One review of title from same author'
             )
         ]
+        indexes = [
+            models.Index(fields=['title', 'pub_date', 'id'],
+                         name='review_title_pub_date_idx'),
+            models.Index(fields=['author', 'pub_date'],
+                         name='review_author_pub_date_idx'),
+        ]
+
+    @classmethod
+    def apply_comment_count(cls, pk, delta):
+        """Изменяет число комментариев отзыва, см. apply_comment_counts."""
+        return cls.apply_comment_counts({pk: delta})
+
+    @classmethod
+    def apply_comment_counts(cls, deltas):
+        """
+        Атомарно изменяет число комментариев отзывов одним UPDATE.
+        deltas: {pk: изменение числа комментариев}.
+        """
+        return cls.objects.filter(pk__in=deltas).update(
+            comment_count=F('comment_count') + Case(
+                *[When(pk=pk, then=Value(delta))
+                  for pk, delta in deltas.items()],
+                default=Value(0),
+                output_field=models.IntegerField(),
+            ))
 
 
 class Comments(Feedback):
@@ -214,3 +315,209 @@ class Comments(Feedback):
         default_related_name = 'comments'
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(fields=['review', 'pub_date', 'id'],
+                         name='comments_review_pub_date_idx'),
+            models.Index(fields=['author', 'pub_date'],
+                         name='comments_author_pub_date_idx'),
+        ]
+
+
+def score_counter(score):
+    return models.PositiveIntegerField(
+        default=0,
+        verbose_name=f'Число оценок {score}',
+    )
+
+
+class TitleStats(models.Model):
+    """Статистика отзывов произведения: гистограмма оценок и активность"""
+
+    SCORES = range(1, 11)
+
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Произведение',
+    )
+    score_1 = score_counter(1)
+    score_2 = score_counter(2)
+    score_3 = score_counter(3)
+    score_4 = score_counter(4)
+    score_5 = score_counter(5)
+    score_6 = score_counter(6)
+    score_7 = score_counter(7)
+    score_8 = score_counter(8)
+    score_9 = score_counter(9)
+    score_10 = score_counter(10)
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество комментариев',
+    )
+    last_activity = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Последняя активность',
+    )
+
+    class Meta:
+        verbose_name = 'Статистика произведения'
+        verbose_name_plural = 'Статистика произведений'
+
+    def __str__(self):
+        return str(self.title_id)
+
+    @property
+    def histogram(self):
+        return {score: getattr(self, f'score_{score}')
+                for score in self.SCORES}
+
+    @classmethod
+    def apply(cls, title_id, scores=None, comments=0):
+        """
+        Атомарно изменяет счётчики оценок ({оценка: изменение})
+        и комментариев произведения и отмечает время активности.
+        """
+        updates = {
+            f'score_{score}': F(f'score_{score}') + delta
+            for score, delta in (scores or {}).items() if delta
+        }
+        if comments:
+            updates['comment_count'] = F('comment_count') + comments
+        updates['last_activity'] = timezone.now()
+        stats = cls.objects.filter(title_id=title_id)
+        if not stats.update(**updates):
+            cls.objects.get_or_create(title_id=title_id)
+            stats.update(**updates)
+
+    @classmethod
+    def add_scores(cls, scores):
+        """
+        Учитывает пакет новых оценок [(id произведения, оценка)]:
+        не больше одного UPDATE на каждое значение оценки.
+        """
+        cls.objects.bulk_create(
+            [cls(title_id=title_id) for title_id, _ in scores],
+            ignore_conflicts=True,
+        )
+        titles_by_score = defaultdict(list)
+        for title_id, score in scores:
+            titles_by_score[score].append(title_id)
+        now = timezone.now()
+        for score, title_ids in titles_by_score.items():
+            cls.objects.filter(title_id__in=title_ids).update(**{
+                f'score_{score}': F(f'score_{score}') + 1,
+                'last_activity': now,
+            })
+
+
+class OutboxMessage(models.Model):
+    """Исходящее письмо в очереди на отправку"""
+
+    subject = models.CharField(
+        max_length=settings.OUTBOX_SUBJECT_MAX_LENGTH,
+        verbose_name='Тема',
+    )
+    message = models.TextField(verbose_name='Текст')
+    from_email = models.EmailField(
+        null=True,
+        blank=True,
+        verbose_name='Отправитель',
+    )
+    recipient = models.EmailField(
+        max_length=settings.USERS_EMAIL_MAX_LENGTH,
+        verbose_name='Получатель',
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата постановки в очередь',
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Следующая попытка',
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Число попыток',
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Дата отправки',
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Последняя ошибка',
+    )
+
+    class Meta:
+        ordering = ('next_attempt_at',)
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = [
+            models.Index(fields=['sent_at', 'next_attempt_at'],
+                         name='outbox_pending_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
+
+
+class ChangeLogEntry(models.Model):
+    """Запись журнала изменений отзывов и комментариев"""
+
+    REVIEW = 'review'
+    COMMENT = 'comment'
+    MODEL_CHOICES = [
+        (REVIEW, REVIEW),
+        (COMMENT, COMMENT),
+    ]
+    CREATED = 'created'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+    ACTION_CHOICES = [
+        (CREATED, CREATED),
+        (UPDATED, UPDATED),
+        (DELETED, DELETED),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    model = models.CharField(
+        max_length=16,
+        choices=MODEL_CHOICES,
+        verbose_name='Модель',
+    )
+    action = models.CharField(
+        max_length=16,
+        choices=ACTION_CHOICES,
+        verbose_name='Действие',
+    )
+    object_id = models.PositiveIntegerField(verbose_name='Id объекта')
+    # Без внешнего ключа: журнал только дополняется и переживает
+    # удаление произведения.
+    title_id = models.PositiveIntegerField(verbose_name='Id произведения')
+    review_id = models.PositiveIntegerField(verbose_name='Id отзыва')
+    payload = models.TextField(
+        blank=True,
+        verbose_name='Данные объекта (JSON)',
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата изменения',
+    )
+
+    class Meta:
+        ordering = ('id',)
+        verbose_name = 'Запись журнала изменений'
+        verbose_name_plural = 'Журнал изменений'
+        indexes = [
+            models.Index(fields=['title_id', 'id'],
+                         name='changelog_title_id_idx'),
+            models.Index(fields=['review_id', 'id'],
+                         name='changelog_review_id_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.model} {self.object_id}: {self.action}'
@@ -0,0 +1,221 @@
+import json
+import os
+import time
+
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api import throttling
+from reviews.models import Category, Comments, Genre, Review, Title, User
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__),
+                             'benchmark_baseline.json')
+
+
+class Scale:
+    """Размер набора данных, задаётся переменными окружения."""
+
+    def __init__(self):
+        self.titles = int(os.getenv('BENCHMARK_TITLES', 200))
+        self.genres = int(os.getenv('BENCHMARK_GENRES', 10))
+        self.reviews = int(os.getenv('BENCHMARK_REVIEWS_PER_TITLE', 10))
+        self.comments = int(os.getenv('BENCHMARK_COMMENTS_PER_REVIEW', 3))
+        self.requests = int(os.getenv('BENCHMARK_REQUESTS', 50))
+
+
+def seed(scale):
+    """Заполняет БД набором данных заданного размера."""
+    User.objects.bulk_create(
+        User(username=f'reader{i}', email=f'reader{i}@yamdb.fake')
+        for i in range(max(scale.reviews, 1))
+    )
+    User.objects.create(username='bench_admin', email='admin@yamdb.fake',
+                        role=User.ADMIN)
+    category = Category.objects.create(name='Фильм', slug='movie')
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {i}', slug=f'genre{i}')
+        for i in range(scale.genres)
+    )
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {i}', year=1900 + i % 120,
+              category=category, description='Описание')
+        for i in range(scale.titles)
+    )
+    genres = list(Genre.objects.values_list('pk', flat=True))
+    titles = list(Title.objects.values_list('pk', flat=True))
+    readers = list(User.objects.filter(username__startswith='reader')
+                   .values_list('pk', flat=True))
+    Title.genre.through.objects.bulk_create(
+        Title.genre.through(title_id=title, genre_id=genres[i % len(genres)])
+        for i, title in enumerate(titles)
+    )
+    Review.objects.bulk_create(
+        Review(title_id=title, author_id=reader, text='Отзыв',
+               score=1 + (title + reader) % 10)
+        for title in titles for reader in readers[:scale.reviews]
+    )
+    Comments.objects.bulk_create(
+        Comments(review_id=review, author_id=readers[i % len(readers)],
+                 text='Комментарий')
+        for review in Review.objects.values_list('pk', flat=True)
+        for i in range(scale.comments)
+    )
+    call_command('rebuild_counters', stdout=open(os.devnull, 'w'))
+    call_command('rebuild_stats', stdout=open(os.devnull, 'w'))
+
+
+def calibrate(rounds=7):
+    """
+    Время фиксированной нагрузки на процессор в мс (медиана).
+    Задержки сценариев сравниваются с базовой линией в этих единицах,
+    чтобы результат не зависел от скорости машины.
+    """
+    payload = [{'id': i, 'name': f'Произведение {i}', 'rating': i / 7}
+               for i in range(2000)]
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(5):
+            json.loads(json.dumps(payload))
+            sorted(payload, key=lambda item: (-item['rating'], item['name']))
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def scenarios():
+    """
+    Сценарии: имя, метод, URL, данные, токен и подготовка,
+    которая выполняется перед каждым замеряемым запросом.
+    """
+    title = Title.objects.order_by('pk').first()
+    review = title.review.order_by('pk').first()
+    admin = User.objects.get(username='bench_admin')
+    reader = User.objects.filter(username__startswith='reader').first()
+    admin_token = f'Bearer {AccessToken.for_user(admin)}'
+    code = default_token_generator.make_token(reader)
+
+    def delete_admin_review():
+        Review.objects.filter(title=title, author=admin).delete()
+
+    def reset_throttles():
+        cache.clear()
+        throttling.reset()
+
+    return (
+        ('titles-list', 'get', '/api/v1/titles/', {}, None, cache.clear),
+        ('titles-list-cached', 'get', '/api/v1/titles/', {}, None, None),
+        ('titles-detail', 'get', f'/api/v1/titles/{title.pk}/', {}, None,
+         cache.clear),
+        ('reviews-list', 'get', f'/api/v1/titles/{title.pk}/reviews/', {},
+         None, None),
+        ('reviews-create', 'post', f'/api/v1/titles/{title.pk}/reviews/',
+         {'text': 'Отзыв', 'score': 7}, admin_token, delete_admin_review),
+        ('comments-list', 'get',
+         f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/', {},
+         None, None),
+        ('auth-token', 'post', '/api/v1/auth/token/',
+         {'username': reader.username, 'confirmation_code': code}, None,
+         reset_throttles),
+        ('users-list', 'get', '/api/v1/users/', {}, admin_token, None),
+        ('users-me', 'get', '/api/v1/users/me/', {}, admin_token, None),
+    )
+
+
+def run(requests):
+    """
+    Прогоняет сценарии и возвращает метрики по каждому из них.
+    p95_rel — p95 в единицах калибровочной нагрузки (calibrate).
+    """
+    results = {}
+    calibration = calibrate()
+    for name, method, url, data, token, setup in scenarios():
+        client = APIClient()
+        if token:
+            client.credentials(HTTP_AUTHORIZATION=token)
+        latencies = []
+        queries = 0
+        if setup:
+            setup()
+        getattr(client, method)(url, data)
+        for _ in range(requests):
+            if setup:
+                setup()
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                response = getattr(client, method)(url, data)
+                latencies.append((time.perf_counter() - started) * 1000)
+            assert response.status_code in (200, 201), (
+                f'Сценарий {name}: {method.upper()} {url} вернул '
+                f'{response.status_code}'
+            )
+            queries += len(context.captured_queries)
+        latencies.sort()
+        results[name] = {
+            'p50_ms': round(percentile(latencies, 0.5), 2),
+            'p95_ms': round(percentile(latencies, 0.95), 2),
+            'p99_ms': round(percentile(latencies, 0.99), 2),
+            'p95_rel': round(percentile(latencies, 0.95) / calibration, 4),
+            'queries': round(queries / requests, 2),
+            'rps': round(requests * 1000 / sum(latencies), 1),
+        }
+    return results
+
+
+def format_report(results):
+    lines = [f'{"сценарий":<20}{"p50":>9}{"p95":>9}{"p99":>9}'
+             f'{"запросов":>10}{"запр/с":>9}']
+    for name, metrics in results.items():
+        lines.append(
+            f'{name:<20}{metrics["p50_ms"]:>9}{metrics["p95_ms"]:>9}'
+            f'{metrics["p99_ms"]:>9}{metrics["queries"]:>10}'
+            f'{metrics["rps"]:>9}'
+        )
+    return '\n'.join(lines)
+
+
+def load_baseline():
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH, encoding='utf-8') as baseline:
+        return json.load(baseline)
+
+
+def save_baseline(results):
+    with open(BASELINE_PATH, 'w', encoding='utf-8') as baseline:
+        json.dump(results, baseline, indent=2, sort_keys=True)
+        baseline.write('\n')
+
+
+def find_regressions(results, baseline, tolerance):
+    """
+    Сравнение с базовой линией: (регрессии, предупреждения).
+    Регрессия — рост числа запросов к БД. Предупреждение — p95
+    в единицах калибровки больше чем в (1 + tolerance) раз выше
+    базовой линии: задержки шумят и сами по себе тест не роняют.
+    """
+    regressions = []
+    warnings = []
+    for name, metrics in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if metrics['queries'] > expected['queries']:
+            regressions.append(
+                f'{name}: запросов к БД {metrics["queries"]} '
+                f'(базовая линия {expected["queries"]})')
+        if ('p95_rel' in expected and metrics['p95_rel']
+                > expected['p95_rel'] * (1 + tolerance)):
+            warnings.append(
+                f'{name}: p95 {metrics["p95_rel"]} единиц калибровки '
+                f'(базовая линия {expected["p95_rel"]})')
+    return regressions, warnings
@@ -1,9 +1,76 @@
 import sys
 from os.path import abspath, dirname, join
 
+import pytest
+
 root_dir = dirname(dirname(abspath(__file__)))
 sys.path.append(root_dir)
 infra_dir_path = join(root_dir, 'infra')
 
 pytest_plugins = [
 ]
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--benchmark',
+        action='store_true',
+        help='Запустить нагрузочные тесты API',
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--benchmark'):
+        return
+    skip = pytest.mark.skip(reason='нужен флаг --benchmark')
+    for item in items:
+        if 'benchmark' in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def category(db):
+    from reviews.models import Category
+    return Category.objects.create(name='Фильм', slug='movie')
+
+
+@pytest.fixture
+def genre(db):
+    from reviews.models import Genre
+    return Genre.objects.create(name='Драма', slug='drama')
+
+
+@pytest.fixture
+def author(db):
+    from reviews.models import User
+    return User.objects.create(username='author', email='author@yamdb.fake')
+
+
+@pytest.fixture
+def title(category, genre):
+    from reviews.models import Title
+    title = Title.objects.create(name='Произведение', year=2000,
+                                 category=category)
+    title.genre.add(genre)
+    return title
+
+
+@pytest.fixture
+def review(title, author):
+    """Отзыв с оценкой 5; рейтинг и статистика обновлены, как во вьюсете."""
+    from reviews.models import Review, Title, TitleStats
+    review = Review.objects.create(title=title, author=author, text='Отзыв',
+                                   score=5)
+    Title.apply_score(title.pk, review.score, 1)
+    TitleStats.apply(title.pk, {review.score: 1})
+    return review
+
+
+@pytest.fixture
+def comment(review):
+    from reviews.models import Comments, Review, TitleStats
+    comment = Comments.objects.create(review=review, author=review.author,
+                                      text='Ок')
+    Review.apply_comment_count(review.pk, 1)
+    TitleStats.apply(review.title_id, comments=1)
+    return comment
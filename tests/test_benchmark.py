@@ -0,0 +1,34 @@
+import os
+import warnings
+
+import pytest
+
+from .benchmark import (Scale, find_regressions, format_report,
+                        load_baseline, run, save_baseline, seed)
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+class TestBenchmark:
+
+    def test_api_benchmark(self):
+        scale = Scale()
+        seed(scale)
+        results = run(scale.requests)
+        print('\n' + format_report(results))
+
+        if os.getenv('BENCHMARK_UPDATE_BASELINE'):
+            save_baseline(results)
+            return
+        regressions, slowdowns = find_regressions(
+            results, load_baseline(),
+            float(os.getenv('BENCHMARK_TOLERANCE', 1.0)))
+        if os.getenv('BENCHMARK_LATENCY_GATE'):
+            regressions += slowdowns
+        else:
+            for slowdown in slowdowns:
+                warnings.warn(f'Задержка выше базовой линии: {slowdown}')
+        assert not regressions, (
+            'Проверьте производительность API, найдены регрессии:\n'
+            + '\n'.join(regressions)
+        )
@@ -0,0 +1,97 @@
+import pytest
+from rest_framework.test import APIClient
+
+from reviews.models import Review, Title, TitleStats
+
+URL = '/api/v1/reviews/bulk/'
+
+
+@pytest.fixture
+def titles(category):
+    return [
+        Title.objects.create(name=f'Произведение {i}', year=2000,
+                             category=category)
+        for i in range(3)
+    ]
+
+
+@pytest.fixture
+def client(author):
+    client = APIClient()
+    client.force_authenticate(author)
+    return client
+
+
+def counters(title):
+    title.refresh_from_db()
+    stats = TitleStats.objects.filter(title=title).first()
+    histogram = stats.histogram if stats else {}
+    return (title.review_count, title.score_sum, title.rating,
+            {score: count for score, count in histogram.items() if count})
+
+
+@pytest.mark.django_db
+class TestBulkReviews:
+
+    def test_all_created(self, client, titles):
+        response = client.post(URL, [
+            {'title': titles[0].pk, 'text': 'Отзыв', 'score': 8},
+            {'title': titles[1].pk, 'text': 'Отзыв', 'score': 3},
+        ], format='json')
+
+        assert response.status_code == 201, (
+            'Проверьте, что пакет без ошибок возвращает статус 201'
+        )
+        assert [item['status'] for item in response.json()] == [
+            'created', 'created']
+        assert counters(titles[0]) == (1, 8, 8.0, {8: 1})
+        assert counters(titles[1]) == (1, 3, 3.0, {3: 1})
+        assert Review.objects.count() == 2
+
+    def test_partially_created(self, client, titles, author):
+        Review.objects.create(title=titles[2], author=author, text='Отзыв',
+                              score=5)
+        response = client.post(URL, [
+            {'title': titles[0].pk, 'text': 'Отзыв', 'score': 6},
+            {'title': titles[1].pk, 'text': 'Отзыв', 'score': 11},
+            {'title': titles[2].pk, 'text': 'Отзыв', 'score': 7},
+            {'title': 0, 'text': 'Отзыв', 'score': 7},
+            {'title': titles[0].pk, 'text': 'Повтор', 'score': 1},
+        ], format='json')
+
+        assert response.status_code == 207, (
+            'Проверьте, что частично принятый пакет возвращает статус 207'
+        )
+        results = response.json()
+        assert [item['status'] for item in results] == [
+            'created', 'error', 'error', 'error', 'error']
+        assert [item['index'] for item in results] == list(range(5))
+        assert set(results[1]['errors']) == {'score'}
+        assert set(results[3]['errors']) == {'title'}
+        assert counters(titles[0]) == (1, 6, 6.0, {6: 1}), (
+            'Проверьте, что счётчики учитывают только созданные отзывы'
+        )
+        assert counters(titles[1]) == (0, 0, None, {})
+        assert Review.objects.filter(title=titles[2]).get().score == 5
+
+    def test_nothing_created(self, client, titles):
+        response = client.post(URL, [
+            {'title': titles[0].pk, 'text': 'Отзыв', 'score': 0},
+            {'title': titles[1].pk, 'score': 5},
+        ], format='json')
+
+        assert response.status_code == 400, (
+            'Проверьте, что пакет без корректных элементов возвращает '
+            'статус 400'
+        )
+        assert [item['status'] for item in response.json()] == [
+            'error', 'error']
+        assert not Review.objects.exists()
+        assert counters(titles[0]) == (0, 0, None, {})
+        assert not TitleStats.objects.exists()
+
+    @pytest.mark.parametrize('data', ([], {'title': 1}))
+    def test_invalid_batch(self, client, data):
+        response = client.post(URL, data, format='json')
+
+        assert response.status_code == 400
@@ -0,0 +1,55 @@
+import pytest
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.test import APIClient
+
+from api.cache import CATALOG_GENERATION_KEY, get_generation
+from reviews.models import Title
+
+
+@pytest.mark.django_db
+class TestCatalogCache:
+
+    def test_write_invalidates_cached_list(self, title):
+        cache.clear()
+        client = APIClient()
+        assert client.get('/api/v1/titles/').json()['count'] == 1
+
+        Title.objects.create(name='Другое', year=2001,
+                             category=title.category)
+
+        assert client.get('/api/v1/titles/').json()['count'] == 2, (
+            'Проверьте, что запись в каталог сбрасывает кэш списков'
+        )
+
+    def test_etag_not_modified(self, title):
+        cache.clear()
+        client = APIClient()
+        url = f'/api/v1/titles/{title.pk}/'
+        etag = client.get(url)['ETag']
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            'Проверьте, что совпадающий If-None-Match даёт ответ 304'
+        )
+
+        title.name = 'Новое название'
+        title.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+        assert response.json()['name'] == 'Новое название'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_generation_bumped_again_after_commit(category):
+    with transaction.atomic():
+        Title.objects.create(name='Произведение', year=2000,
+                             category=category)
+        inside = get_generation(CATALOG_GENERATION_KEY)
+
+    assert get_generation(CATALOG_GENERATION_KEY) > inside, (
+        'Проверьте, что поколение каталога меняется после фиксации: '
+        'ответ, закэшированный до неё, не должен оставаться в силе'
+    )
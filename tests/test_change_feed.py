@@ -0,0 +1,91 @@
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from reviews.models import (Category, ChangeLogEntry, Comments, Review, Title,
+                            TitleStats, User)
+
+
+@pytest.mark.django_db
+class TestChangeFeed:
+
+    def test_feed_after_cursor(self, settings):
+        settings.CHANGE_FEED_SETTLE_SECONDS = 0
+        category = Category.objects.create(name='Фильм', slug='movie')
+        title = Title.objects.create(name='Произведение', year=2000,
+                                     category=category)
+        user = User.objects.create(username='user', email='user@yamdb.fake')
+        review = Review.objects.create(title=title, author=user,
+                                       text='Отзыв', score=5)
+        client = APIClient()
+        cursor = client.get('/api/v1/changes/').json()['cursor']
+
+        review.score = 7
+        review.save()
+        Comments.objects.create(review=review, author=user, text='Ок')
+        review.delete()
+        response = client.get('/api/v1/changes/', {'cursor': cursor})
+
+        assert response.status_code == 200, (
+            'Проверьте, что лента изменений доступна без авторизации'
+        )
+        changes = [(change['model'], change['action'])
+                   for change in response.json()['results']]
+        assert changes == [
+            ('review', 'updated'),
+            ('comment', 'created'),
+            ('comment', 'deleted'),
+            ('review', 'deleted'),
+        ], 'Проверьте, что лента отдаёт изменения после курсора по порядку'
+        assert response.json()['results'][0]['data']['score'] == 7
+
+    def test_entries_written_in_change_transaction(self, review):
+        ChangeLogEntry.objects.all().delete()
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                review.text = 'Изменён'
+                review.save()
+                assert ChangeLogEntry.objects.get().action == (
+                    ChangeLogEntry.UPDATED), (
+                    'Проверьте, что запись журнала пишется в транзакции '
+                    'самого изменения'
+                )
+                raise RuntimeError
+
+        assert not ChangeLogEntry.objects.exists(), (
+            'Проверьте, что откаченные изменения не попадают в журнал'
+        )
+
+    @pytest.mark.parametrize('delete_author', (False, True))
+    def test_cascade_without_review_lookups(self, review, delete_author):
+        reader = User.objects.create(username='reader',
+                                     email='reader@yamdb.fake')
+        other = Review.objects.create(title=review.title, author=reader,
+                                      text='Отзыв', score=3)
+        for target in (review, other):
+            Comments.objects.bulk_create(
+                Comments(review=target, author=author, text='Ок')
+                for author in (review.author, reader) for _ in range(3))
+            Review.apply_comment_count(target.pk, 6)
+        TitleStats.apply(review.title_id, comments=12)
+        ChangeLogEntry.objects.all().delete()
+
+        with CaptureQueriesContext(connection) as context:
+            if delete_author:
+                review.author.delete()
+            else:
+                review.delete()
+
+        lookups = [query['sql'] for query in context.captured_queries
+                   if query['sql'].startswith('SELECT')
+                   and 'FROM "reviews_review" WHERE' in query['sql']
+                   and '"reviews_review"."id" =' in query['sql']]
+        assert not lookups, (
+            'Проверьте, что при каскадном удалении произведение '
+            'комментариев не загружается для каждого комментария'
+        )
+        comments = ChangeLogEntry.objects.filter(model=ChangeLogEntry.COMMENT)
+        assert comments.count() == (9 if delete_author else 6)
+        assert set(comments.values_list('title_id', flat=True)) == {
+            review.title_id}
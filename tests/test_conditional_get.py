@@ -0,0 +1,54 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from reviews.models import Comments
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+
+    def test_reviews_not_modified(self, review):
+        client = APIClient()
+        url = f'/api/v1/titles/{review.title_id}/reviews/'
+        response = client.get(url)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+
+        for headers in ({'HTTP_IF_NONE_MATCH': etag},
+                        {'HTTP_IF_MODIFIED_SINCE': last_modified}):
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url, **headers)
+            assert response.status_code == 304, (
+                f'Проверьте, что `{url}` отвечает 304 на {headers}'
+            )
+            assert len(queries) == 1, (
+                'Проверьте, что ответ 304 строится одним запросом '
+                'без выборки списка'
+            )
+
+        Comments.objects.create(review=review, author=review.author,
+                                text='Ок')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200, (
+            'Проверьте, что после изменения отзывов произведения список '
+            'отдаётся заново'
+        )
+        assert response['ETag'] != etag
+
+    def test_comments_not_modified(self, comment):
+        client = APIClient()
+        url = (f'/api/v1/titles/{comment.review.title_id}/reviews/'
+               f'{comment.review_id}/comments/')
+        etag = client.get(url)['ETag']
+
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        comment.delete()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200, (
+            'Проверьте, что удаление комментария меняет ETag списка'
+        )
+        assert response.json()['results'] == []
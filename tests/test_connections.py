@@ -0,0 +1,59 @@
+from api import connections
+
+
+class FakeConnection:
+    """Соединение, оборванное сервером БД, если оно открыто."""
+
+    in_atomic_block = False
+    released_at = 0
+
+    def __init__(self, opened):
+        self.connection = object() if opened else None
+
+    def is_usable(self):
+        return False
+
+    def close(self):
+        self.connection = None
+
+    def ensure_connection(self):
+        raise AssertionError('Соединение не должно открываться заранее')
+
+
+class FakeConnections:
+
+    def __init__(self, *aliases):
+        self.aliases = aliases
+
+    def all(self):
+        return list(self.aliases)
+
+
+class TestCheckoutConnections:
+
+    def test_closed_connection_is_not_opened(self, monkeypatch):
+        closed = FakeConnection(opened=False)
+        monkeypatch.setattr(connections, 'connections',
+                            FakeConnections(closed))
+        connections.stats.reset()
+
+        connections.checkout_connections()
+
+        assert closed.connection is None, (
+            'Проверьте, что перед запросом соединение с БД не открывается'
+        )
+        assert connections.stats.snapshot()['checkouts'] == 0
+
+    def test_broken_connection_is_closed(self, monkeypatch):
+        broken = FakeConnection(opened=True)
+        monkeypatch.setattr(connections, 'connections',
+                            FakeConnections(broken))
+        connections.stats.reset()
+
+        connections.checkout_connections()
+
+        assert broken.connection is None, (
+            'Проверьте, что оборванное соединение закрывается до запроса'
+        )
+        snapshot = connections.stats.snapshot()
+        assert (snapshot['checkouts'], snapshot['broken']) == (1, 1)
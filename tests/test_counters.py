@@ -0,0 +1,125 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from reviews.models import Comments, Review, Title, TitleStats, User
+
+
+@pytest.mark.django_db
+class TestCounters:
+
+    def test_counts_exposed_and_maintained(self, review):
+        reader = User.objects.create(username='reader', email='r@yamdb.fake')
+        client = APIClient()
+        client.force_authenticate(reader)
+        url = f'/api/v1/titles/{review.title_id}/reviews/{review.pk}/comments/'
+        comment_id = client.post(url, {'text': 'Ок'}).json()['id']
+        client.post(url, {'text': 'Ещё'})
+
+        reviews = client.get(f'/api/v1/titles/{review.title_id}/reviews/')
+        assert reviews.json()['results'][0]['comment_count'] == 2, (
+            'Проверьте, что список отзывов отдаёт число комментариев'
+        )
+        title = client.get(f'/api/v1/titles/{review.title_id}/').json()
+        assert title['review_count'] == 1, (
+            'Проверьте, что произведение отдаёт число отзывов'
+        )
+
+        client.delete(f'{url}{comment_id}/')
+        review.refresh_from_db()
+        assert review.comment_count == 1
+
+        reader.delete()
+        review.refresh_from_db()
+        assert review.comment_count == 0, (
+            'Проверьте, что удаление пользователя уменьшает счётчики '
+            'комментариев его отзывов'
+        )
+
+    def test_author_deletion_releases_title_counters(self, review):
+        review.author.delete()
+
+        title = Title.objects.get(pk=review.title_id)
+        assert (title.review_count, title.rating) == (0, None)
+
+    def test_rebuild_counters(self, review):
+        Comments.objects.create(review=review, author=review.author,
+                                text='Ок')
+        Review.objects.update(comment_count=7)
+        Title.objects.update(review_count=3)
+
+        call_command('rebuild_counters')
+
+        review.refresh_from_db()
+        assert review.comment_count == 1
+        assert Title.objects.get(pk=review.title_id).review_count == 1
+        call_command('rebuild_counters', check=True)
+
+    def test_author_deletion_releases_title_stats(self, title, category):
+        other_title = Title.objects.create(name='Другое', year=2001,
+                                           category=category)
+        leaving, staying = (
+            User.objects.create(username=name, email=f'{name}@yamdb.fake')
+            for name in ('leaving', 'staying'))
+        clients = {}
+        for user in (leaving, staying):
+            clients[user] = APIClient()
+            clients[user].force_authenticate(user)
+        reviews = {}
+        for user, target, score in ((leaving, title, 8),
+                                    (staying, title, 3),
+                                    (staying, other_title, 6)):
+            url = f'/api/v1/titles/{target.pk}/reviews/'
+            reviews[user, target] = clients[user].post(
+                url, {'text': 'Отзыв', 'score': score}).json()['id']
+        for user in (leaving, staying):
+            for (_, target), review_id in reviews.items():
+                clients[user].post(
+                    f'/api/v1/titles/{target.pk}/reviews/{review_id}/'
+                    'comments/', {'text': 'Ок'})
+        call_command('rebuild_stats', check=True)
+
+        leaving.delete()
+
+        stats = TitleStats.objects.get(title=title)
+        assert ({score: count for score, count in stats.histogram.items()
+                 if count}, stats.comment_count) == ({3: 1}, 1), (
+            'Проверьте, что удаление пользователя уменьшает гистограмму '
+            'оценок и число комментариев произведения'
+        )
+        call_command('rebuild_stats', check=True)
+
+    def test_rebuild_stats(self, comment):
+        TitleStats.objects.filter(title=comment.review.title).update(
+            score_5=0, score_7=2, comment_count=4)
+        with pytest.raises(CommandError):
+            call_command('rebuild_stats', check=True)
+
+        call_command('rebuild_stats')
+
+        stats = TitleStats.objects.get(title=comment.review.title)
+        assert (stats.score_5, stats.score_7, stats.comment_count) == (
+            1, 0, 1)
+        call_command('rebuild_stats', check=True)
+
+    def test_rebuild_stats_is_set_based(self, category, author):
+        titles = Title.objects.bulk_create(
+            Title(name=f'Произведение {i}', year=2000, category=category)
+            for i in range(50))
+        Review.objects.bulk_create(
+            Review(title=title, author=author, text='Отзыв', score=4)
+            for title in Title.objects.all())
+        TitleStats.objects.all().delete()
+
+        with CaptureQueriesContext(connection) as context:
+            call_command('rebuild_stats', batch_size=20)
+
+        assert len(context.captured_queries) <= 10, (
+            'Проверьте, что статистика пересчитывается пакетами, '
+            'а не запросами на каждое произведение'
+        )
+        assert TitleStats.objects.filter(score_4=1).count() == len(titles)
+        call_command('rebuild_stats', check=True)
@@ -0,0 +1,46 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api import dictionaries
+from api.serializers import TitleCreateSerializer
+from reviews.models import Category, Genre
+
+
+@pytest.mark.django_db
+class TestSlugDictionaries:
+
+    def test_slugs_resolved_without_queries(self):
+        dictionaries.reset()
+        Category.objects.create(name='Фильм', slug='movie')
+        for slug in ('drama', 'comedy', 'thriller'):
+            Genre.objects.create(name=slug, slug=slug)
+        data = {'name': 'Произведение', 'year': 2000, 'category': 'movie',
+                'genre': ['drama', 'comedy', 'thriller']}
+        assert TitleCreateSerializer(data=data).is_valid()
+
+        with CaptureQueriesContext(connection) as queries:
+            serializer = TitleCreateSerializer(data=data)
+            assert serializer.is_valid(), serializer.errors
+
+        assert not queries, (
+            'Проверьте, что слаги жанров и категории разрешаются '
+            'по словарю в памяти без запросов к БД'
+        )
+        assert [genre.slug for genre in serializer.validated_data['genre']
+                ] == data['genre']
+
+    def test_dictionary_invalidated_on_write(self):
+        dictionaries.reset()
+        assert 'horror' not in dictionaries.slug_dictionary(Genre)
+
+        Genre.objects.create(name='Ужасы', slug='horror')
+
+        assert 'horror' in dictionaries.slug_dictionary(Genre), (
+            'Проверьте, что запись в таблицу жанров меняет версию словаря'
+        )
+        serializer = TitleCreateSerializer(data={
+            'name': 'Произведение', 'year': 2000, 'category': 'missing',
+            'genre': ['horror']})
+        assert not serializer.is_valid()
+        assert set(serializer.errors) == {'category'}
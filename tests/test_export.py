@@ -0,0 +1,77 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import Category, Genre, Review, Title, User
+
+
+@pytest.mark.django_db
+class TestExport:
+
+    def client(self, role):
+        user = User.objects.create(username=role, email=f'{role}@yamdb.fake',
+                                   role=role)
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+        return client
+
+    def test_titles_export(self):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(name='Произведение', year=2000,
+                                     category=category)
+        title.genre.add(genre)
+        client = self.client(User.ADMIN)
+
+        response = client.get('/api/v1/export/titles/', {'format': 'csv'})
+        assert response.status_code == 200, (
+            'Проверьте, что администратор может выгрузить произведения'
+        )
+        assert b''.join(response.streaming_content).decode().splitlines() == [
+            'id,name,year,category,description,rating',
+            f'{title.pk},Произведение,2000,{category.pk},,',
+        ], 'Проверьте, что CSV совпадает с раскладкой static/data'
+
+        response = client.get('/api/v1/export/titles/',
+                              {'format': 'ndjson'})
+        record = json.loads(b''.join(response.streaming_content))
+        assert record['genre'] == [genre.pk], (
+            'Проверьте, что в NDJSON у произведения есть жанры'
+        )
+
+    def test_export_is_admin_only(self):
+        response = self.client(User.USER).get('/api/v1/export/titles/')
+
+        assert response.status_code == 403, (
+            'Проверьте, что выгрузка доступна только администратору'
+        )
+
+    def test_titles_updated_since(self, title, author):
+        since = timezone.now()
+        Title.objects.filter(pk=title.pk).update(
+            updated_at=since - timedelta(days=1))
+        other = Title.objects.create(name='Другое', year=2001)
+        client = self.client(User.ADMIN)
+
+        def exported():
+            response = client.get('/api/v1/export/titles/', {
+                'format': 'ndjson', 'updated_since': since.isoformat()})
+            return [json.loads(line)['id'] for line in b''.join(
+                response.streaming_content).splitlines()]
+
+        assert exported() == [other.pk], (
+            'Проверьте, что выгрузка произведений отбирает их по дате '
+            'изменения'
+        )
+        Review.objects.create(title=title, author=author, text='Отзыв',
+                              score=7)
+        Title.apply_score(title.pk, 7, 1)
+        assert exported() == [title.pk, other.pk], (
+            'Проверьте, что изменение рейтинга обновляет дату изменения '
+            'произведения'
+        )
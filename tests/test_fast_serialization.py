@@ -0,0 +1,62 @@
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from reviews.models import Category, Comments, Genre, Review, Title, User
+
+
+def create_catalog():
+    category = Category.objects.create(name='Фильм', slug='movie')
+    genres = [
+        Genre.objects.create(name='Драма', slug='drama'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+    users = [
+        User.objects.create(username=f'user{i}', email=f'user{i}@yamdb.fake')
+        for i in range(3)
+    ]
+    for i in range(5):
+        title = Title.objects.create(
+            name=f'Произведение {i}', year=2000 + i,
+            category=category if i % 2 else None,
+            description='Описание' if i % 3 else None,
+            rating=None if i == 0 else i + 0.6,
+        )
+        title.genre.set(genres[:i % 3])
+        for user in users[:i % 4]:
+            review = Review.objects.create(
+                title=title, author=user, text='Отзыв', score=3 + i)
+            Comments.objects.create(review=review, author=user, text='Ок')
+    return Review.objects.filter(title__name='Произведение 3').first()
+
+
+def get_content(url, params, fast, settings):
+    settings.FAST_LIST_SERIALIZATION = fast
+    cache.clear()
+    response = APIClient().get(url, params)
+    assert response.status_code == 200, (
+        f'Проверьте, что GET-запрос к `{url}` возвращает статус 200'
+    )
+    return response.content
+
+
+@pytest.mark.django_db
+class TestFastSerialization:
+
+    @pytest.mark.parametrize('params', [
+        {}, {'page_size': 2}, {'pagination': 'cursor', 'page_size': 2},
+    ])
+    def test_lists_are_byte_identical(self, params, settings):
+        review = create_catalog()
+        for url in (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{review.title_id}/reviews/',
+            f'/api/v1/titles/{review.title_id}/reviews/{review.pk}/comments/',
+        ):
+            fast = get_content(url, params, True, settings)
+            regular = get_content(url, params, False, settings)
+
+            assert fast == regular, (
+                f'Проверьте, что быстрая сериализация `{url}` '
+                'совпадает с обычной побайтно'
+            )
@@ -0,0 +1,55 @@
+import csv
+import os
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+from reviews.management.commands.import_csv import (
+    SOURCES, build_objects, copy_rows, preserve_auto_now_add, read_rows)
+from reviews.models import Review
+
+DATA_DIR = os.path.join(settings.BASE_DIR, 'static', 'data')
+
+
+def csv_rows(filename):
+    with open(os.path.join(DATA_DIR, filename), encoding='utf-8',
+              newline='') as csv_file:
+        return list(csv.DictReader(csv_file))
+
+
+@pytest.mark.django_db
+class TestImportCsv:
+
+    def test_import_static_data(self):
+        devnull = open(os.devnull, 'w')
+        call_command('import_csv', '--no-copy', stdout=devnull)
+
+        for filename, model, _ in SOURCES:
+            rows = csv_rows(filename)
+            assert model.objects.count() == len(rows), (
+                f'Проверьте, что из {filename} загружены все строки'
+            )
+        row = csv_rows('review.csv')[0]
+        review = Review.objects.get(pk=row['id'])
+        assert review.pub_date.isoformat().startswith(row['pub_date'][:19]), (
+            'Проверьте, что дата публикации берётся из файла'
+        )
+        call_command('rebuild_counters', check=True, stdout=devnull)
+
+    @pytest.mark.parametrize('filename,model,columns', SOURCES)
+    def test_copy_rows_fill_not_null_columns(self, filename, model, columns):
+        fields = model._meta.concrete_fields
+        objects = build_objects(model, read_rows(
+            os.path.join(DATA_DIR, filename)), columns)
+
+        with preserve_auto_now_add(model):
+            rows = list(copy_rows(model, objects))
+
+        for row in rows:
+            empty = [field.column for field, value in zip(fields, row)
+                     if value == r'\N' and not field.null]
+            assert not empty, (
+                f'Проверьте, что строки COPY для {filename} не содержат '
+                f'NULL в обязательных колонках: {", ".join(empty)}'
+            )
@@ -0,0 +1,57 @@
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+
+def migrate(target):
+    """Переводит схему на миграцию и возвращает её модели."""
+    executor = MigrationExecutor(connection)
+    executor.migrate([('reviews', target)] if target
+                     else executor.loader.graph.leaf_nodes())
+    executor.loader.build_graph()
+    return executor.loader.project_state(
+        [('reviews', target)] if target
+        else executor.loader.graph.leaf_nodes()).apps
+
+
+@pytest.fixture
+def old_reviews(transactional_db):
+    """Отзывы, созданные до денормализации рейтинга."""
+    apps = migrate('0001_initial')
+    Title = apps.get_model('reviews', 'Title')
+    User = apps.get_model('reviews', 'User')
+    Review = apps.get_model('reviews', 'Review')
+    title = Title.objects.create(name='Произведение', year=2000)
+    Comments = apps.get_model('reviews', 'Comments')
+    for name, score in (('author', 4), ('reader', 9)):
+        author = User.objects.create(username=name,
+                                     email=f'{name}@yamdb.fake')
+        review = Review.objects.create(title=title, author=author,
+                                       text='Отзыв', score=score)
+    Comments.objects.create(review=review, author=author, text='Ок')
+    yield title.pk
+    migrate(None)
+
+
+class TestMigrations:
+
+    def test_ratings_backfilled(self, old_reviews):
+        apps = migrate('0002_title_rating_denormalized')
+        title = apps.get_model('reviews', 'Title').objects.get()
+
+        assert (title.score_sum, title.review_count, title.rating) == (
+            13, 2, 6.5), (
+            'Проверьте, что миграция заполняет рейтинг по существующим '
+            'отзывам'
+        )
+
+    def test_title_stats_backfilled(self, old_reviews):
+        apps = migrate('0006_title_stats')
+        stats = apps.get_model('reviews', 'TitleStats').objects.get()
+
+        assert ((stats.score_4, stats.score_9, stats.comment_count)
+                == (1, 1, 1)), (
+            'Проверьте, что миграция заполняет гистограмму оценок '
+            'по существующим отзывам'
+        )
+        assert stats.last_activity is not None
@@ -0,0 +1,59 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from reviews.models import Review, Title, User
+
+
+def lookups(model, queries):
+    """Число SELECT к таблице модели."""
+    table = f'FROM "{model._meta.db_table}"'
+    return sum(query['sql'].startswith('SELECT') and table in query['sql']
+               for query in queries)
+
+
+@pytest.fixture
+def reader(db):
+    client = APIClient()
+    client.force_authenticate(
+        User.objects.create(username='reader', email='reader@yamdb.fake'))
+    return client
+
+
+@pytest.mark.django_db
+class TestNestedRoutes:
+
+    def test_review_create_loads_title_once(self, reader, title):
+        with CaptureQueriesContext(connection) as context:
+            response = reader.post(f'/api/v1/titles/{title.pk}/reviews/',
+                                   {'text': 'Отзыв', 'score': 7})
+
+        assert response.status_code == 201
+        assert lookups(Title, context.captured_queries) == 1, (
+            'Проверьте, что произведение из URL загружается один раз '
+            'за запрос'
+        )
+
+    def test_comment_create_loads_review_once(self, reader, review):
+        with CaptureQueriesContext(connection) as context:
+            response = reader.post(
+                f'/api/v1/titles/{review.title_id}/reviews/{review.pk}/'
+                'comments/', {'text': 'Ок'})
+
+        assert response.status_code == 201
+        assert lookups(Review, context.captured_queries) == 1, (
+            'Проверьте, что отзыв из URL загружается один раз за запрос'
+        )
+
+    def test_comments_of_review_from_other_title(self, reader, review,
+                                                 category):
+        other = Title.objects.create(name='Другое', year=2001,
+                                     category=category)
+        url = f'/api/v1/titles/{other.pk}/reviews/{review.pk}/comments/'
+
+        assert reader.get(url).status_code == 404, (
+            'Проверьте, что отзыв ищется только среди отзывов '
+            'произведения из URL'
+        )
+        assert reader.post(url, {'text': 'Ок'}).status_code == 404
@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.utils import timezone
+
+from api import mail as outbox
+from api.mail import enqueue_mail, purge_outbox, send_pending
+from reviews.models import OutboxMessage
+
+LOCMEM_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+
+class BrokenConnection:
+
+    def open(self):
+        raise ConnectionRefusedError('SMTP недоступен')
+
+
+@pytest.mark.django_db
+class TestOutbox:
+
+    def test_sent_message_redacted(self, settings):
+        settings.EMAIL_BACKEND = LOCMEM_BACKEND
+        enqueue_mail('Код', 'Код подтверждения: 123', 'user@yamdb.fake')
+
+        assert send_pending() == (1, 0)
+
+        assert mail.outbox[-1].body == 'Код подтверждения: 123'
+        message = OutboxMessage.objects.get()
+        assert message.sent_at is not None
+        assert message.message == '', (
+            'Проверьте, что текст отправленного письма стирается'
+        )
+
+    def test_connection_error_backs_off(self, monkeypatch):
+        monkeypatch.setattr(outbox, 'get_connection', BrokenConnection)
+        enqueue_mail('Код', 'Код подтверждения: 123', 'user@yamdb.fake')
+
+        assert send_pending() == (0, 1), (
+            'Проверьте, что ошибка открытия соединения не прерывает воркер'
+        )
+
+        message = OutboxMessage.objects.get()
+        assert message.attempts == 1
+        assert message.sent_at is None
+        assert message.next_attempt_at > timezone.now()
+        assert 'SMTP' in message.last_error
+        assert send_pending() == (0, 0)
+
+    def test_purge_old_messages(self, settings):
+        settings.EMAIL_BACKEND = LOCMEM_BACKEND
+        enqueue_mail('Код', 'Текст', 'old@yamdb.fake')
+        send_pending()
+        enqueue_mail('Код', 'Текст', 'new@yamdb.fake')
+        OutboxMessage.objects.filter(recipient='old@yamdb.fake').update(
+            sent_at=timezone.now() - timedelta(days=30))
+
+        assert purge_outbox(retention=86400) == 1
+        assert list(OutboxMessage.objects.values_list(
+            'recipient', flat=True)) == ['new@yamdb.fake']
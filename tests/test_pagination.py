@@ -0,0 +1,44 @@
+import pytest
+from rest_framework.test import APIClient
+
+from reviews.models import Title
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+
+    def test_titles_cursor_order_and_next_link(self, category):
+        for name in ('В', 'А', 'Б', 'А', 'Г'):
+            Title.objects.create(name=name, year=2000, category=category)
+        expected = list(Title.objects.order_by('name', 'id')
+                        .values_list('id', flat=True))
+        client = APIClient()
+
+        response = client.get('/api/v1/titles/',
+                              {'pagination': 'cursor', 'page_size': 2})
+        assert response.status_code == 200
+        assert 'count' not in response.json(), (
+            'Проверьте, что курсорная пагинация не считает COUNT(*)'
+        )
+        seen = []
+        while True:
+            page = response.json()
+            assert len(page['results']) <= 2
+            seen.extend(title['id'] for title in page['results'])
+            if page['next'] is None:
+                break
+            assert 'cursor=' in page['next']
+            response = client.get(page['next'])
+
+        assert seen == expected, (
+            'Проверьте, что страницы курсора идут по (name, id) '
+            'без пропусков и повторов'
+        )
+
+    def test_page_number_pagination_by_default(self, category):
+        Title.objects.create(name='А', year=2000, category=category)
+
+        page = APIClient().get('/api/v1/titles/').json()
+
+        assert page['count'] == 1
+        assert page['next'] is None
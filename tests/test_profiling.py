@@ -0,0 +1,59 @@
+import pytest
+from rest_framework.test import APIClient
+
+from api import profiling
+
+
+@pytest.fixture
+def profiles(monkeypatch, settings):
+    """Включает профилирование и собирает замеры запросов."""
+    settings.PROFILING_ENABLED = True
+    recorded = []
+
+    class RecordedProfile(profiling.RequestProfile):
+        def __init__(self):
+            super().__init__()
+            recorded.append(self)
+
+    monkeypatch.setattr(profiling, 'RequestProfile', RecordedProfile)
+    return recorded
+
+
+@pytest.mark.django_db
+class TestProfiling:
+
+    @pytest.mark.parametrize('fast', (True, False))
+    def test_list_serializer_time(self, fast, settings, profiles, review):
+        settings.FAST_LIST_SERIALIZATION = fast
+        response = APIClient().get(
+            f'/api/v1/titles/{review.title_id}/reviews/')
+        assert response.status_code == 200
+        assert profiles[-1].serializer_time > 0, (
+            'Проверьте, что время сериализации списка учитывается '
+            'и при сериализации строк из values()'
+        )
+
+    def test_server_timing_header(self, profiles, review):
+        response = APIClient().get(
+            f'/api/v1/titles/{review.title_id}/reviews/')
+        metrics = dict(
+            metric.strip().split(';', 1)
+            for metric in response['Server-Timing'].split(','))
+        assert set(metrics) == {'db', 'serializer', 'total'}, (
+            'Проверьте, что заголовок Server-Timing содержит метрики '
+            'db, serializer и total'
+        )
+        assert metrics['db'].endswith(
+            f'desc="{profiles[-1].queries} queries"')
+        durations = {name: float(value.split(';')[0].split('=')[1])
+                     for name, value in metrics.items()}
+        assert durations['total'] >= durations['db']
+        assert durations['total'] >= durations['serializer']
+
+    def test_disabled(self, settings, review):
+        settings.PROFILING_ENABLED = False
+        response = APIClient().get(
+            f'/api/v1/titles/{review.title_id}/reviews/')
+        assert 'Server-Timing' not in response, (
+            'Проверьте, что без PROFILING_ENABLED заголовок не добавляется'
+        )
@@ -0,0 +1,66 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from reviews.models import Category, Genre, Review, Title, User
+
+
+def create_titles(count):
+    category = Category.objects.create(name='Фильм', slug='movie')
+    genres = [
+        Genre.objects.create(name='Драма', slug='drama'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {i}', year=2000, category=category)
+        for i in range(count)
+    )
+    for title in Title.objects.all():
+        title.genre.set(genres)
+
+
+def count_queries(url):
+    client = APIClient()
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, {'page_size': 100})
+    assert response.status_code == 200, (
+        f'Проверьте, что GET-запрос к `{url}` возвращает статус 200'
+    )
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db
+class TestQueryCount:
+
+    def test_titles_list_query_count(self):
+        create_titles(10)
+        small_page = count_queries('/api/v1/titles/')
+        Title.objects.all().delete()
+        Category.objects.all().delete()
+        Genre.objects.all().delete()
+        create_titles(100)
+        large_page = count_queries('/api/v1/titles/')
+
+        assert large_page == small_page, (
+            'Проверьте, что число запросов к БД для списка произведений '
+            f'не зависит от размера страницы: {small_page} != {large_page}'
+        )
+
+    def test_reviews_list_query_count(self):
+        create_titles(1)
+        title = Title.objects.get()
+        User.objects.bulk_create(
+            User(username=f'user{i}', email=f'user{i}@yamdb.fake')
+            for i in range(50)
+        )
+        Review.objects.bulk_create(
+            Review(title=title, author=user, text='Текст', score=5)
+            for user in User.objects.all()
+        )
+        queries = count_queries(f'/api/v1/titles/{title.id}/reviews/')
+
+        assert queries <= 3, (
+            'Проверьте, что автор и произведение отзывов загружаются '
+            f'без N+1 запросов: выполнено {queries} запросов'
+        )
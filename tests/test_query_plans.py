@@ -0,0 +1,101 @@
+import re
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from rest_framework.test import APIClient
+
+# Таблицы, которые растут вместе с каталогом: полный проход по ним
+# означает, что запросу не хватает индекса.
+LARGE_TABLES = {
+    'reviews_title',
+    'reviews_title_genre',
+    'reviews_review',
+    'reviews_comments',
+    'reviews_changelogentry',
+}
+
+SEQUENTIAL_SCAN = {
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    'sqlite': re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$'),
+}
+
+
+def capture_selects(url, params):
+    """SQL и параметры всех SELECT, выполненных при запросе к url."""
+    queries = []
+
+    def wrapper(execute, sql, sql_params, many, context):
+        if sql.lstrip().upper().startswith('SELECT'):
+            queries.append((sql, sql_params))
+        return execute(sql, sql_params, many, context)
+
+    cache.clear()
+    with connection.execute_wrapper(wrapper):
+        response = APIClient().get(url, params)
+    assert response.status_code == 200, (
+        f'Проверьте, что GET-запрос к `{url}` возвращает статус 200'
+    )
+    return queries
+
+
+def explain(sql, params):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # На маленьком наборе PostgreSQL предпочтёт Seq Scan и при
+            # наличии индекса; без него Seq Scan остаётся только там,
+            # где подходящего индекса нет. Настройка сбрасывается сразу,
+            # чтобы не влиять на другие тесты на том же соединении.
+            cursor.execute('SET enable_seqscan = off')
+            try:
+                cursor.execute(f'EXPLAIN {sql}', params)
+                return [row[-1] for row in cursor.fetchall()]
+            finally:
+                cursor.execute('RESET enable_seqscan')
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def sequential_scans(plan):
+    pattern = SEQUENTIAL_SCAN[connection.vendor]
+    return {
+        match.group(1) for match in map(pattern.search, plan) if match
+    } & LARGE_TABLES
+
+
+ENDPOINTS = (
+    ('/api/v1/titles/', {}),
+    ('/api/v1/titles/', {'genre': 'drama'}),
+    ('/api/v1/titles/', {'category': 'movie'}),
+    ('/api/v1/titles/', {'year': 2000}),
+    ('/api/v1/titles/', {'pagination': 'cursor'}),
+    ('/api/v1/titles/top/', {}),
+    ('/api/v1/titles/top/', {'category': 'movie'}),
+    ('/api/v1/titles/top/', {'year': 2000}),
+    ('/api/v1/titles/{title}/', {}),
+    ('/api/v1/titles/{title}/reviews/', {}),
+    ('/api/v1/titles/{title}/reviews/', {'pagination': 'cursor'}),
+    ('/api/v1/titles/{title}/reviews/{review}/comments/', {}),
+    ('/api/v1/changes/', {'cursor': 1}),
+    ('/api/v1/changes/', {'title': '{title}'}),
+)
+
+
+@pytest.mark.django_db
+class TestQueryPlans:
+
+    @pytest.mark.parametrize('url,params', ENDPOINTS)
+    def test_no_sequential_scans(self, comment, url, params):
+        ids = {'title': comment.review.title_id,
+               'review': comment.review_id}
+        url = url.format(**ids)
+        params = {key: str(value).format(**ids)
+                  for key, value in params.items()}
+        for sql, sql_params in capture_selects(url, params):
+            plan = explain(sql, sql_params)
+            scans = sequential_scans(plan)
+
+            assert not scans, (
+                f'Проверьте индексы для `{url}`: полный проход по '
+                f'{", ".join(sorted(scans))}\n{sql}\n' + '\n'.join(plan)
+            )
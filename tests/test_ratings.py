@@ -0,0 +1,50 @@
+import pytest
+from django.core.management import CommandError, call_command
+from rest_framework.test import APIClient
+
+from reviews.models import Title, User
+
+
+def client_for(username):
+    user = User.objects.create(username=username,
+                               email=f'{username}@yamdb.fake')
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.mark.django_db
+class TestRatings:
+
+    def test_rating_maintained_on_review_writes(self, title):
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        first, second = client_for('first'), client_for('second')
+        review_id = first.post(url, {'text': 'Отзыв', 'score': 4}).json()['id']
+        second.post(url, {'text': 'Отзыв', 'score': 8})
+        title.refresh_from_db()
+        assert (title.score_sum, title.review_count, title.rating) == (
+            12, 2, 6.0), 'Проверьте пересчёт рейтинга при создании отзыва'
+
+        first.patch(f'{url}{review_id}/', {'score': 10})
+        title.refresh_from_db()
+        assert (title.score_sum, title.review_count, title.rating) == (
+            18, 2, 9.0), 'Проверьте пересчёт рейтинга при изменении оценки'
+
+        first.delete(f'{url}{review_id}/')
+        title.refresh_from_db()
+        assert (title.score_sum, title.review_count, title.rating) == (
+            8, 1, 8.0), 'Проверьте пересчёт рейтинга при удалении отзыва'
+        call_command('rebuild_ratings', check=True)
+
+    def test_rebuild_ratings_repairs_drift(self, review):
+        Title.objects.update(rating=3)
+        with pytest.raises(CommandError):
+            call_command('rebuild_ratings', check=True)
+
+        Title.objects.update(rating=None, review_count=4)
+        call_command('rebuild_ratings')
+
+        title = Title.objects.get(pk=review.title_id)
+        assert (title.score_sum, title.review_count, title.rating) == (
+            5, 1, 5.0)
+        call_command('rebuild_ratings', check=True)
@@ -0,0 +1,61 @@
+import datetime
+import decimal
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from api.renderers import FastJSONRenderer, StreamingJSONRenderer
+from api.views import ReviewViewSet
+from reviews.models import Category, Review, Title, User
+
+
+class TestFastJSONRenderer:
+
+    def test_output_matches_json_renderer(self):
+        data = {
+            'name': 'Произведение\u2028',
+            'rating': None,
+            'score': 7,
+            'values': [1.5, True, decimal.Decimal('2.50')],
+            'pub_date': datetime.datetime(
+                2022, 1, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'date': datetime.date(2022, 1, 1),
+            1: 'ключ',
+        }
+
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(
+            data), (
+            'Проверьте, что FastJSONRenderer выводит тот же JSON, '
+            'что и JSONRenderer'
+        )
+
+
+@pytest.mark.django_db
+class TestStreamingJSONRenderer:
+
+    def test_stream_matches_regular_response(self, monkeypatch):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        title = Title.objects.create(name='Произведение', year=2000,
+                                     category=category)
+        for i in range(7):
+            user = User.objects.create(username=f'user{i}',
+                                       email=f'user{i}@yamdb.fake')
+            Review.objects.create(title=title, author=user, text='Отзыв',
+                                  score=i + 1)
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        client = APIClient()
+        for params in ({'page_size': 3}, {'pagination': 'cursor'}):
+            regular = client.get(url, params)
+            monkeypatch.setattr(ReviewViewSet, 'renderer_classes',
+                                (StreamingJSONRenderer,))
+            streamed = client.get(url, params)
+            monkeypatch.undo()
+
+            assert streamed.streaming, (
+                'Проверьте, что со StreamingJSONRenderer список '
+                'отдаётся потоковым ответом'
+            )
+            assert b''.join(streamed.streaming_content) == regular.content, (
+                'Проверьте, что потоковый ответ совпадает с обычным'
+            )
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from rest_framework.test import APIClient
+
+from api import search
+from reviews.models import Title
+
+
+def found(query):
+    response = APIClient().get('/api/v1/titles/', {'search': query})
+    assert response.status_code == 200
+    return [title['name'] for title in response.json()['results']]
+
+
+@pytest.mark.django_db
+class TestTitleSearch:
+
+    def test_prefix_match_ranked_by_name(self, category):
+        Title.objects.create(name='Война и мир', year=1869,
+                             category=category, description='Роман')
+        Title.objects.create(name='Мир', year=2000, category=category,
+                             description='Война миров')
+        Title.objects.create(name='Тишина', year=2001, category=category)
+
+        assert found('войн') == ['Война и мир', 'Мир'], (
+            'Проверьте, что слова запроса ищутся как префиксы, а совпадение '
+            'в названии важнее совпадения в описании'
+        )
+        assert found('войн мир') == ['Война и мир', 'Мир']
+        assert found('тиш война') == []
+
+    @pytest.mark.skipif(connection.vendor == 'postgresql',
+                        reason='индекс в памяти используется без PostgreSQL')
+    def test_index_updated_per_title(self, category, monkeypatch):
+        title = Title.objects.create(name='Гроза', year=1859,
+                                     category=category)
+        other = Title.objects.create(name='Гром', year=2000,
+                                     category=category)
+        assert found('гро') == ['Гроза', 'Гром']
+
+        def rebuild(rows):
+            raise AssertionError('Индекс перестроен целиком')
+
+        monkeypatch.setattr(search.title_index, 'build', rebuild)
+        title.name = 'Бесприданница'
+        title.save()
+        other.delete()
+
+        assert found('гро') == [], (
+            'Проверьте, что изменённое и удалённое произведения '
+            'переиндексируются без полной перестройки индекса'
+        )
+        assert found('бесп') == ['Бесприданница']
+
+    def test_benchmark_refuses_populated_database(self, title):
+        with pytest.raises(CommandError):
+            call_command('benchmark_search', titles=10, queries=2)
+
+    def test_benchmark_rolls_back(self):
+        call_command('benchmark_search', titles=50, queries=2,
+                     stdout=open(os.devnull, 'w'))
+
+        assert not Title.objects.exists()
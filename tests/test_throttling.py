@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+from django.core.cache import cache
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from api import throttling
+
+
+@pytest.mark.django_db
+class TestThrottling:
+
+    def test_token_endpoint_is_throttled_by_username(self):
+        cache.clear()
+        throttling.reset()
+        capacity, _ = throttling.parse_rate(
+            throttling.api_settings.DEFAULT_THROTTLE_RATES['token_username'])
+        client = APIClient()
+        data = {'username': 'ghost', 'confirmation_code': 'code'}
+        for _ in range(capacity):
+            response = client.post('/api/v1/auth/token/', data)
+            assert response.status_code != 429, (
+                'Проверьте, что запросы в пределах ёмкости корзины '
+                'не ограничиваются'
+            )
+
+        response = client.post('/api/v1/auth/token/', data)
+
+        assert response.status_code == 429, (
+            'Проверьте, что при пустой корзине `/api/v1/auth/token/` '
+            'возвращает статус 429'
+        )
+        assert int(response['Retry-After']) > 0, (
+            'Проверьте, что ответ 429 содержит заголовок Retry-After'
+        )
+        assert throttling.rejected_counts()['token_username'] == 1
+
+    def test_rotating_forwarded_for_keeps_bucket(self):
+        cache.clear()
+        throttling.reset()
+        capacity, _ = throttling.parse_rate(
+            throttling.api_settings.DEFAULT_THROTTLE_RATES['token'])
+        client = APIClient()
+        statuses = [
+            client.post(
+                '/api/v1/auth/token/',
+                {'username': f'ghost{i}', 'confirmation_code': 'code'},
+                # Адрес, подставленный клиентом, и адрес от nginx.
+                HTTP_X_FORWARDED_FOR=f'10.0.0.{i}, 192.0.2.1',
+            ).status_code
+            for i in range(capacity + 1)
+        ]
+
+        assert 429 not in statuses[:capacity]
+        assert statuses[-1] == 429, (
+            'Проверьте, что адрес клиента берётся от доверенного прокси '
+            'и подмена X-Forwarded-For не обнуляет корзину'
+        )
+
+    def test_concurrent_requests_share_bucket(self, monkeypatch):
+        class SlowCache:
+            """Общий кэш с задержкой чтения, как у сетевого memcached."""
+
+            def __getattr__(self, name):
+                return getattr(cache, name)
+
+            def get(self, *args, **kwargs):
+                value = cache.get(*args, **kwargs)
+                time.sleep(0.001)
+                return value
+
+        monkeypatch.setattr(throttling, 'cache', SlowCache())
+        cache.clear()
+        throttling.reset()
+        capacity, _ = throttling.parse_rate(
+            throttling.api_settings.DEFAULT_THROTTLE_RATES['token'])
+        view = type('View', (), {'throttle_scope': 'token'})()
+        barrier = threading.Barrier(capacity * 2)
+        allowed = []
+
+        def attempt():
+            request = Request(APIRequestFactory().post('/'))
+            barrier.wait()
+            allowed.append(
+                throttling.IPThrottle().allow_request(request, view))
+
+        threads = [threading.Thread(target=attempt)
+                   for _ in range(capacity * 2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert allowed.count(True) == capacity, (
+            'Проверьте, что параллельные запросы не тратят один токен '
+            'дважды'
+        )
+
+
+def test_blocked_keys_evict_oldest(monkeypatch):
+    throttling.reset()
+    monkeypatch.setattr(throttling, 'MAX_BLOCKED_KEYS', 2)
+    for key in ('first', 'second', 'third'):
+        throttling.block(key, until=100, now=0)
+
+    assert list(throttling._blocked) == ['second', 'third'], (
+        'Проверьте, что при заполненном словаре удаляется самая '
+        'старая блокировка'
+    )
@@ -0,0 +1,61 @@
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from reviews.models import Category, Title
+
+URL = '/api/v1/titles/top/'
+
+
+@pytest.fixture
+def titles(category, genre):
+    """Рейтинг и число отзывов: у 'Д' рейтинг как у 'Б', но id больше."""
+    book = Category.objects.create(name='Книга', slug='book')
+    created = {}
+    for name, rating, review_count, year, title_category in (
+            ('А', 7.5, 2, 2000, category),
+            ('Б', 9.0, 1, 2001, book),
+            ('В', None, 0, 2000, category),
+            ('Г', 9.5, 0, 2000, category),
+            ('Д', 9.0, 3, 2000, category)):
+        created[name] = Title.objects.create(
+            name=name, year=year, category=title_category, rating=rating,
+            review_count=review_count)
+    created['А'].genre.add(genre)
+    created['Д'].genre.add(genre)
+    cache.clear()
+    return created
+
+
+def top(params=None):
+    response = APIClient().get(URL, params or {})
+    assert response.status_code == 200
+    return [title['name'] for title in response.json()]
+
+
+@pytest.mark.django_db
+class TestTopTitles:
+
+    def test_ordering(self, titles):
+        assert top() == ['Б', 'Д', 'А'], (
+            'Проверьте, что топ упорядочен по убыванию рейтинга, при '
+            'равном рейтинге по id, и не содержит произведений без '
+            'рейтинга и отзывов'
+        )
+
+    @pytest.mark.parametrize('params, expected', (
+        ({'limit': 2}, ['Б', 'Д']),
+        ({'min_reviews': 0}, ['Г', 'Б', 'Д', 'А']),
+        ({'min_reviews': 2}, ['Д', 'А']),
+        ({'category': 'movie'}, ['Д', 'А']),
+        ({'genre': 'drama'}, ['Д', 'А']),
+        ({'year': 2001}, ['Б']),
+    ))
+    def test_filters(self, titles, params, expected):
+        assert top(params) == expected
+
+    @pytest.mark.parametrize('limit', (0, 101, 'много'))
+    def test_invalid_limit(self, titles, limit):
+        response = APIClient().get(URL, {'limit': limit})
+
+        assert response.status_code == 400
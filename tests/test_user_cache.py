@@ -0,0 +1,101 @@
+import os
+import pickle
+import runpy
+from types import SimpleNamespace
+
+import pytest
+from django.conf import settings as django_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api import authentication
+from reviews.models import User
+
+GUNICORN_CONFIG = os.path.join(django_settings.BASE_DIR, 'gunicorn.conf.py')
+
+
+def token_client(user):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+    return client
+
+
+@pytest.mark.django_db
+class TestCachedUser:
+
+    def test_role_change_invalidates_cached_user(self):
+        admin = User.objects.create(username='boss', email='b@yamdb.fake',
+                                    role=User.ADMIN)
+        client = token_client(admin)
+        assert client.get('/api/v1/users/').status_code == 200
+
+        admin.role = User.USER
+        admin.save()
+
+        assert client.get('/api/v1/users/').status_code == 403, (
+            'Проверьте, что смена роли сразу действует на закэшированного '
+            'пользователя'
+        )
+
+    def test_me_patch_does_not_restore_stale_role(self):
+        admin = User.objects.create(username='boss', email='b@yamdb.fake',
+                                    role=User.ADMIN)
+        client = token_client(admin)
+        client.get('/api/v1/users/me/')
+        # Изменение, которого этот процесс не видел: копия в кэше
+        # по-прежнему с ролью администратора.
+        User.objects.filter(pk=admin.pk).update(role=User.USER)
+
+        response = client.patch('/api/v1/users/me/', {'bio': 'О себе'})
+
+        assert response.status_code == 200
+        admin.refresh_from_db()
+        assert (admin.role, admin.bio) == (User.USER, 'О себе'), (
+            'Проверьте, что PATCH `/api/v1/users/me/` не записывает '
+            'устаревшие поля закэшированного пользователя'
+        )
+
+    def test_password_hash_not_cached(self, monkeypatch):
+        user = User.objects.create(username='user', email='u@yamdb.fake',
+                                   bio='О себе')
+        user.set_password('secret')
+        user.save()
+        cached = {}
+        monkeypatch.setattr(
+            authentication.cache, 'set',
+            lambda key, value, timeout: cached.update({key: value}))
+        monkeypatch.setattr(authentication.cache, 'get', cached.get)
+        client = token_client(user)
+
+        for _ in range(2):
+            response = client.get('/api/v1/users/me/')
+            assert (response.json()['email'], response.json()['bio']) == (
+                'u@yamdb.fake', 'О себе')
+        assert cached, 'Проверьте, что пользователь кэшируется'
+        assert all(user.password.encode() not in pickle.dumps(value)
+                   for value in cached.values()), (
+            'Проверьте, что хэш пароля не попадает в общий кэш'
+        )
+
+
+class TestGunicornCache:
+
+    def on_starting(self, workers):
+        config = runpy.run_path(GUNICORN_CONFIG)
+        config['on_starting'](
+            SimpleNamespace(cfg=SimpleNamespace(workers=workers)))
+
+    def test_refuses_local_cache_with_several_workers(self, settings):
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        with pytest.raises(RuntimeError):
+            self.on_starting(workers=3)
+        self.on_starting(workers=1)
+
+    def test_shared_cache_with_several_workers(self, settings):
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+            'LOCATION': 'memcached:11211',
+        }}
+        self.on_starting(workers=3)